@@ -50,6 +50,7 @@ class PlayingFixedAudioWaveForm(TimedLiveAudioWaveForm, FixedLiveAudioWaveForm):
         bytes: bytes = "",
         with_header: bool = False,
         channels: int = 1,
+        samplesPerPixel: int = 256,
         **kwargs
     ) -> None:
         FixedLiveAudioWaveForm.__init__(self, **kwargs)
@@ -59,6 +60,26 @@ class PlayingFixedAudioWaveForm(TimedLiveAudioWaveForm, FixedLiveAudioWaveForm):
                 file=file, bytes=bytes, with_header=with_header, channels=channels
             )
             self.live.byteArray = bytes
+            if file and self.audiowave.cache:
+                self.setCachedChannels(samplesPerPixel)
+
+    def setCachedChannels(self, samplesPerPixel: int):
+        # the channels without data are built from the peaks and pyramids of
+        # AudioWave.cache, a wave opened before is then not decoded again
+        for channel, waveFormChannel, setChannel in (
+            (1, self.waveFormChannel1, self.setChannel1),
+            (2, self.waveFormChannel2, self.setChannel2),
+        ):
+            if channel > self.audiowave.channels:
+                break
+            if waveFormChannel and waveFormChannel.hasData():
+                continue
+            options = waveFormChannel.options if waveFormChannel else None
+            setChannel(
+                AudioWaveFormChannel.from_audiowave(
+                    self.audiowave, samplesPerPixel, channel, options=options
+                )
+            )
 
     def goLive(self):
         self.live.play()
@@ -1,5 +1,8 @@
-import enum
-import io, wave, typing
+import array as _array
+import mmap as _mmap
+import bisect, enum, sys
+import collections, concurrent.futures, functools, hashlib, tempfile, threading, weakref
+import io, itertools, json, math, multiprocessing, operator, os, struct, wave, typing
 
 __author__ = "PRMPSmart @prmpsmart"
 
@@ -14,64 +17,957 @@ TUPLED_INTS_FLOATS = tuple[typing.Union[float, int]]
 LIST_TUPLED_INTS = list[TUPLED_INTS]
 LIST_TUPLED_INTS_FLOATS = list[TUPLED_INTS_FLOATS]
 
-MAX_CHANNELS = 2
+SAMPLES = typing.Union[INTS_FLOATS, _array.array]
+LIST_SAMPLES = list[SAMPLES]
+
 BUFFER_SIZE = 1024
+PEAKS_BLOCK_FRAMES = BUFFER_SIZE * 64
+CACHE_MAX_BYTES = 256 * BUFFER_SIZE * BUFFER_SIZE
+CACHE_HASH_BYTES = 64 * BUFFER_SIZE
+ARRAYS_MAX_BYTES = 512 * BUFFER_SIZE * BUFFER_SIZE
 
 MIN_SLICE = slice(0, None, 2)
 MAX_SLICE = slice(1, None, 2)
 
+INT32_TYPECODE = "i" if _array.array("i").itemsize == 4 else "l"
+
+# bytes.translate tables, applied to whole buffers at once
+U8_TO_S8 = bytes((i - 128) & 0xFF for i in range(256))
+SIGN_EXTENSION = bytes(0xFF if i & 0x80 else 0 for i in range(256))
+
+
+def typed_array(typecode: str, data: bytes) -> _array.array:
+    """copies little-endian bytes into an array.array in one bulk operation"""
+    typed = _array.array(typecode)
+    typed.frombytes(data[: len(data) - len(data) % typed.itemsize])
+    if sys.byteorder == "big" and typed.itemsize > 1:
+        typed.byteswap()
+    return typed
+
+
+def decode_u8(data: bytes) -> _array.array:
+    return typed_array("B", data)
+
+
+def decode_s8(data: bytes) -> _array.array:
+    """unsigned 8-bit samples recentered around 0, ranging from -128 to 127"""
+    return typed_array("b", bytes(data).translate(U8_TO_S8))
+
+
+def decode_s16(data: bytes) -> _array.array:
+    return typed_array("h", data)
+
+
+def decode_s24(data: bytes) -> _array.array:
+    samples = len(data) // 3
+    data = data[: samples * 3]
+    padded = bytearray(samples * 4)
+    padded[0::4] = bytes(data[0::3])
+    padded[1::4] = bytes(data[1::3])
+    padded[2::4] = bytes(data[2::3])
+    padded[3::4] = bytes(data[2::3]).translate(SIGN_EXTENSION)
+    return typed_array(INT32_TYPECODE, padded)
+
+
+def decode_s32(data: bytes) -> _array.array:
+    return typed_array(INT32_TYPECODE, data)
+
+
+def decode_f32(data: bytes) -> _array.array:
+    return typed_array("f", data)
+
+
+def ulaw_sample(code: int) -> int:
+    # G.711 mu-law code to a 16-bit sample
+    code = ~code & 0xFF
+    magnitude = (((code & 0x0F) << 3) + 0x84) << ((code & 0x70) >> 4)
+    return 0x84 - magnitude if code & 0x80 else magnitude - 0x84
+
+
+def alaw_sample(code: int) -> int:
+    # G.711 A-law code to a 16-bit sample
+    code ^= 0x55
+    segment = (code & 0x70) >> 4
+    magnitude = ((code & 0x0F) << 4) + (8 if segment == 0 else 0x108)
+    if segment > 1:
+        magnitude <<= segment - 1
+    return magnitude if code & 0x80 else -magnitude
+
+
+# low and high bytes of the 16-bit sample of every companded code
+ULAW_LOW = bytes(ulaw_sample(code) & 0xFF for code in range(256))
+ULAW_HIGH = bytes((ulaw_sample(code) >> 8) & 0xFF for code in range(256))
+ALAW_LOW = bytes(alaw_sample(code) & 0xFF for code in range(256))
+ALAW_HIGH = bytes((alaw_sample(code) >> 8) & 0xFF for code in range(256))
+
+
+def decode_companded(data: bytes, low: bytes, high: bytes) -> _array.array:
+    """expands 8-bit companded codes to 16-bit samples, a translate per byte half"""
+    data = bytes(data)
+    expanded = bytearray(len(data) * 2)
+    expanded[0::2] = data.translate(low)
+    expanded[1::2] = data.translate(high)
+    return typed_array("h", expanded)
+
+
+def decode_ulaw(data: bytes) -> _array.array:
+    return decode_companded(data, ULAW_LOW, ULAW_HIGH)
+
+
+def decode_alaw(data: bytes) -> _array.array:
+    return decode_companded(data, ALAW_LOW, ALAW_HIGH)
+
+
+class AudioWaveCodec:
+    """
+    a sample format decoded a whole buffer at a time, decode takes the bytes and returns
+    the samples, decode_real their counterpart centered around 0 when decode is not.
+    real_width is the width in bytes of the decoded samples when not sample_width.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        sample_width: int,
+        decode: typing.Callable[[bytes], SAMPLES],
+        decode_real: typing.Callable[[bytes], SAMPLES] = None,
+        real_width: int = 0,
+        float_samples: bool = False,
+    ):
+        assert sample_width > 0, "sample_width is a positive integer"
+        self.name = name
+        self.sample_width = sample_width
+        self.decode = decode
+        self.decode_real = decode_real
+        self.real_width = real_width or sample_width
+        self.float_samples = float_samples
+
+
+CODECS: dict[str, AudioWaveCodec] = {}
+
+
+def register_codec(codec: AudioWaveCodec) -> AudioWaveCodec:
+    CODECS[codec.name] = codec
+    return codec
+
+
+def get_codec(name: str) -> AudioWaveCodec:
+    assert name in CODECS, f"codec {name!r} is not registered, one of {list(CODECS)}"
+    return CODECS[name]
+
+
+register_codec(AudioWaveCodec("u8", 1, decode_u8, decode_real=decode_s8))
+register_codec(AudioWaveCodec("s8", 1, decode_s8))
+register_codec(AudioWaveCodec("s16le", 2, decode_s16))
+register_codec(AudioWaveCodec("s24le", 3, decode_s24))
+register_codec(AudioWaveCodec("s32le", 4, decode_s32))
+register_codec(AudioWaveCodec("f32le", 4, decode_f32, float_samples=True))
+register_codec(AudioWaveCodec("ulaw", 1, decode_ulaw, real_width=2))
+register_codec(AudioWaveCodec("alaw", 1, decode_alaw, real_width=2))
+
+# the codecs of wave files, by sample width
+PCM_CODECS = {1: "u8", 2: "s16le", 3: "s24le", 4: "s32le"}
+
+
+def pcm_codec(sample_width: int, float_samples: bool = False) -> AudioWaveCodec:
+    if float_samples:
+        assert sample_width == 4, "only 32-bit float samples are supported"
+        return CODECS["f32le"]
+
+    name = PCM_CODECS.get(sample_width or 1)
+    assert name, f"sample width of {sample_width} bytes is not supported"
+    return CODECS[name]
+
+
+def decode(data: bytes, sample_width: int, float_samples: bool = False):
+    return pcm_codec(sample_width, float_samples).decode(data)
+
+
+class ScalingMode(enum.Enum):
+    Linear = enum.auto()
+    Decibel = enum.auto()
+    Logarithmic = enum.auto()
+
+
+DECIBEL_FLOOR = -60
+# the frequency in hz at the bottom of the spectral centroid's log scale, the frame
+# rate assumed for waves without one, and the seconds each centroid of the min, max
+# pairs of a wave spans
+SPECTRUM_LOWEST = 20
+SPECTRUM_FRAME_RATE = 44100
+SPECTRUM_SECONDS = 0.05
+# silence is quieter than SILENCE_THRESHOLD dBFS for at least SILENCE_SECONDS,
+# measured every SILENCE_BLOCK_SECONDS
+SILENCE_THRESHOLD = -50
+SILENCE_SECONDS = 0.5
+SILENCE_BLOCK_SECONDS = 0.01
+
+
+def scale_array(
+    array: SAMPLES,
+    height: float,
+    min_: float,
+    max_: float,
+    mode: ScalingMode = ScalingMode.Linear,
+) -> _array.array:
+    """
+    maps the points onto 0 - height, points below 0 relative to min_ and the rest
+    relative to max_, in a chain of map() over builtins without a python loop.
+    """
+    # indexed by the sign of each point, False for 0 and above, True below
+    factors = (1 / max_ if max_ else 0, 1 / min_ if min_ else 0)
+    signs = map(operator.lt, array, itertools.repeat(0))
+    ratios = map(operator.mul, array, map(factors.__getitem__, signs))
+
+    if mode == ScalingMode.Decibel:
+        # DECIBEL_FLOOR dB at 0, 0 dB at height
+        ratios = map(max, map(abs, ratios), itertools.repeat(1e-12))
+        decibels = map(operator.mul, map(math.log10, ratios), itertools.repeat(20))
+        points = map(
+            operator.mul,
+            map(operator.sub, itertools.repeat(DECIBEL_FLOOR), decibels),
+            itertools.repeat(height / DECIBEL_FLOOR),
+        )
+        points = map(max, points, itertools.repeat(0))
+
+    elif mode == ScalingMode.Logarithmic:
+        # log10(1 + 9 * ratio), 0 at 0 and 1 at 1
+        ratios = map(operator.mul, map(abs, ratios), itertools.repeat(9))
+        logs = map(math.log10, map(operator.add, ratios, itertools.repeat(1)))
+        points = map(operator.mul, logs, itertools.repeat(height))
+
+    else:
+        points = map(operator.mul, ratios, itertools.repeat(height))
+
+    return _array.array("d", points)
+
+
+def decode_real(data: bytes, sample_width: int, float_samples: bool = False):
+    if sample_width > 1 or float_samples:
+        return decode(data, sample_width, float_samples)
+    return decode_s8(data)
+
+
+def peak(samples: SAMPLES) -> TUPLED_INTS_FLOATS:
+    """(min, max, rms) of the samples"""
+    squares = sum(map(operator.mul, samples, samples))
+    return min(samples), max(samples), math.sqrt(squares / len(samples))
+
+
+def spectral_centroid(samples: SAMPLES, frame_rate: int = SPECTRUM_FRAME_RATE) -> int:
+    """
+    the rms frequency of the samples on a log scale from SPECTRUM_LOWEST to half the
+    frame rate, 0 to 255, 0 for silence too.
+    """
+    count = len(samples)
+    if count < 2:
+        return 0
+    frame_rate = frame_rate or SPECTRUM_FRAME_RATE
+    # the energy of a tone of frequency f about its mean is that of its differences
+    # over 4 sin(pi f / frame_rate) ** 2, for a mix the energies weigh the frequencies
+    samples = list(samples)
+    mean = sum(samples) / count
+    energy = math.hypot(*samples) ** 2 - count * mean * mean
+    differences = math.dist(samples[1:], samples[:-1]) ** 2
+    if energy <= 0 or not differences:
+        return 0
+
+    ratio = min(math.sqrt(differences / energy) / 2, 1)
+    frequency = max(math.asin(ratio) * frame_rate / math.pi, SPECTRUM_LOWEST)
+    position = math.log(frequency / SPECTRUM_LOWEST) / math.log(
+        frame_rate / 2 / SPECTRUM_LOWEST
+    )
+    return round(255 * min(position, 1))
+
+
+def spectrum_window(frame_rate: int) -> int:
+    """the even frames of SPECTRUM_SECONDS at frame_rate, whole min, max pairs"""
+    frames = (frame_rate or SPECTRUM_FRAME_RATE) * SPECTRUM_SECONDS
+    return 2 * max(round(frames / 2), 1)
+
+
+def spectral_centroids(
+    samples: SAMPLES, samples_per_pixel: int, frame_rate: int = SPECTRUM_FRAME_RATE
+) -> _array.array:
+    """spectral_centroid of every samples_per_pixel samples"""
+    starts = range(0, len(samples), samples_per_pixel)
+    stops = map(operator.add, starts, itertools.repeat(samples_per_pixel))
+    pixels = map(samples.__getitem__, map(slice, starts, stops))
+    return _array.array(
+        "B", map(spectral_centroid, pixels, itertools.repeat(frame_rate))
+    )
+
+
+def deinterleave(samples: SAMPLES, channels: int) -> LIST_SAMPLES:
+    """strided views of each channel, sharing the memory of the samples"""
+    if not isinstance(samples, list):
+        samples = memoryview(samples)
+
+    if channels == 1:
+        return [samples]
+    return [samples[channel::channels] for channel in range(channels)]
+
+
+def sizeof(value: typing.Any) -> int:
+    """approximate bytes owned by a value, views own none of their memory"""
+    if isinstance(value, memoryview):
+        return 0
+
+    if isinstance(value, _array.array):
+        return value.itemsize * len(value)
+
+    if isinstance(value, (list, tuple)):
+        size = sys.getsizeof(value)
+        if value:
+            first = value[0]
+            if isinstance(first, (list, tuple, _array.array, memoryview)):
+                size += sum(map(sizeof, value))
+            else:
+                size += len(value) * sys.getsizeof(first)
+        return size
+
+    return sys.getsizeof(value)
+
+
+def view_bases(value: typing.Any) -> dict[int, typing.Any]:
+    """the objects the memoryviews within a value keep alive, by their id"""
+    if isinstance(value, memoryview):
+        return {id(value.obj): value.obj}
+
+    bases = {}
+    if isinstance(value, (list, tuple)) and value:
+        if isinstance(value[0], (list, tuple, memoryview)):
+            for item in value:
+                bases.update(view_bases(item))
+    return bases
+
+
+def quantise(
+    values: SAMPLES, sample_width: int, bits: int, float_samples: bool = False
+) -> _array.array:
+    """rescales real samples to signed integers of the given bits"""
+    source_bits = 1 if float_samples else (sample_width or 1) * 8
+    factor = 2 ** (bits - 1) / 2 ** (source_bits - 1)
+    low, high = -(2 ** (bits - 1)), 2 ** (bits - 1) - 1
+    typecode = "b" if bits == 8 else "h"
+
+    if factor == 1 and not float_samples:
+        # floored for points kept as floats, clamped for points past the width
+        floors = map(math.floor, values)
+        clamped = map(
+            max, itertools.repeat(low), map(min, itertools.repeat(high), floors)
+        )
+        return _array.array(typecode, clamped)
+
+    return _array.array(
+        typecode,
+        (max(low, min(high, math.floor(value * factor))) for value in values),
+    )
+
+
+# typecodes of the sample widths memoryview.cast can reinterpret in place
+VIEW_TYPECODES = {1: "B", 2: "h", 4: INT32_TYPECODE}
+SAMPLE_MAPS = 64
+ANALYSIS_WORKERS = os.cpu_count() or 1
+# the least frames a worker process analyses, fewer are not worth the round trip
+ANALYSIS_FRAMES = 2**16
+
+
+def view(data: memoryview, sample_width: int, float_samples: bool = False):
+    """zero-copy typed view over the samples, decodes when a view is not possible"""
+    typecode = "f" if float_samples else VIEW_TYPECODES.get(sample_width or 1)
+
+    if typecode and (sys.byteorder == "little" or sample_width == 1):
+        data = memoryview(data).cast("B")
+        itemsize = sample_width or 1
+        return data[: len(data) - len(data) % itemsize].cast(typecode)
+
+    return decode(data, sample_width, float_samples)
+
+
+@functools.lru_cache(SAMPLE_MAPS)
+def sample_bounds(length: int, pixels: int) -> TUPLED_INTS:
+    """pixels + 1 boundaries splitting length points into pixels near equal buckets"""
+    return tuple(
+        map(
+            operator.floordiv,
+            range(0, length * pixels + 1, length),
+            itertools.repeat(pixels),
+        )
+    )
+
+
+@functools.lru_cache(SAMPLE_MAPS)
+def interpolation_map(
+    length: int, pixels: int
+) -> tuple[TUPLED_INTS, TUPLED_INTS, FLOATS]:
+    """
+    the points below and above every pixel and its fraction of the way between them,
+    for more pixels than the length points, the first and last pixels on the ends.
+    """
+    step = (length - 1) / (pixels - 1) if pixels > 1 else 0
+    positions = list(map(operator.mul, range(pixels), itertools.repeat(step)))
+    lows = tuple(map(int, positions))
+    highs = tuple(
+        map(
+            min,
+            map(operator.add, lows, itertools.repeat(1)),
+            itertools.repeat(length - 1),
+        )
+    )
+    fractions = tuple(map(operator.sub, positions, lows))
+    return lows, highs, fractions
+
+
+def resample(array: SAMPLES, pixels: int) -> INTS_FLOATS:
+    """
+    exactly pixels points of the array, the first of each bucket when there are more
+    points than pixels, interpolated between the points when there are fewer.
+    """
+    length = len(array)
+    if not (length and pixels):
+        return []
+
+    if length >= pixels:
+        return list(map(array.__getitem__, sample_bounds(length, pixels)[:-1]))
+
+    lows, highs, fractions = interpolation_map(length, pixels)
+    starts = list(map(array.__getitem__, lows))
+    steps = map(operator.sub, map(array.__getitem__, highs), starts)
+    return list(map(operator.add, starts, map(operator.mul, steps, fractions)))
+
+
+class AudioWaveArrayCache:
+    # derived arrays of many AudioWave, least recently used first evicted once
+    # their combined size outgrows max_bytes, the owners derive them again.
+    # an entry depending on another is evicted along with it, and an entry's
+    # views are charged for the memory they keep alive outside the cache.
+
+    def __init__(self, max_bytes: int = ARRAYS_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries: collections.OrderedDict[
+            tuple[int, str], tuple[typing.Any, int, tuple[str]]
+        ] = collections.OrderedDict()
+        self.lock = threading.RLock()
+        # held while a key is derived, other threads wanting it wait instead of
+        # deriving it too
+        self.deriving: dict[tuple[int, str], threading.Lock] = {}
+
+    def dependencies(self, key: tuple[int, str]) -> set[tuple[int, str]]:
+        # the cached entries the key depends on, directly or through others
+        owner = key[0]
+        found = set()
+        pending = list(self.entries[key][2]) if key in self.entries else []
+        while pending:
+            dependency = owner, pending.pop()
+            if dependency not in found and dependency in self.entries:
+                found.add(dependency)
+                pending.extend(self.entries[dependency][2])
+        return found
+
+    def unowned(self, key: tuple[int, str]) -> int:
+        # bytes kept alive by the views of the key's value that none of its cached
+        # dependencies accounts for, mapped files are left out, their pages are
+        # the file's
+        owned = set()
+        for dependency in self.dependencies(key):
+            value = self.entries[dependency][0]
+            owned.add(id(value))
+            owned.update(view_bases(value))
+
+        return sum(
+            sizeof(base)
+            for id_, base in view_bases(self.entries[key][0]).items()
+            if id_ not in owned and not isinstance(base, _mmap.mmap)
+        )
+
+    def touch(self, key: tuple[int, str]):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            owner = key[0]
+            for name in self.entries[key][2]:
+                self.touch((owner, name))
+
+    def get(
+        self,
+        owner: int,
+        name: str,
+        derive: typing.Callable[[], typing.Any],
+        depends: tuple[str] = (),
+    ):
+        key = owner, name
+        with self.lock:
+            if key in self.entries:
+                self.touch(key)
+                return self.entries[key][0]
+            deriving = self.deriving.setdefault(key, threading.Lock())
+
+        # derived outside the lock, other owners are not held up meanwhile
+        with deriving:
+            with self.lock:
+                if key in self.entries:
+                    # derived by another thread meanwhile
+                    self.touch(key)
+                    return self.entries[key][0]
+
+            try:
+                value = derive()
+
+                with self.lock:
+                    self.entries[key] = value, 0, depends
+                    # views are charged for what they keep alive
+                    size = sizeof(value) + self.unowned(key)
+                    self.entries[key] = value, size, depends
+                    self.size += size
+                    self.touch(key)
+                    self.evict(key)
+                    return value
+            finally:
+                with self.lock:
+                    self.deriving.pop(key, None)
+
+    def remove(self, key: tuple[int, str]):
+        if key not in self.entries:
+            return
+
+        _, size, _ = self.entries.pop(key)
+        self.size -= size
+
+        owner, name = key
+        dependents = [
+            dependent
+            for dependent, (_, _, depends) in self.entries.items()
+            if dependent[0] == owner and name in depends
+        ]
+        for dependent in dependents:
+            self.remove(dependent)
+
+    def evict(self, keep: tuple[int, str] = None):
+        # the views of the kept entry keep its whole dependency chain alive
+        kept = {keep}
+        if keep in self.entries:
+            kept.update(self.dependencies(keep))
+
+        for key in list(self.entries):
+            if self.size <= self.max_bytes:
+                break
+            if key not in kept:
+                self.remove(key)
+
+    def setMaxBytes(self, max_bytes: int):
+        with self.lock:
+            self.max_bytes = max_bytes
+            self.evict()
+
+    def discard(self, owner: int):
+        with self.lock:
+            for key in [key for key in self.entries if key[0] == owner]:
+                self.remove(key)
+
+    def usage(self, owner: int) -> dict[str, int]:
+        with self.lock:
+            return {
+                name: size
+                for (owner_, name), (_, size, _) in self.entries.items()
+                if owner_ == owner
+            }
+
+
+AUDIOWAVE_IDS = itertools.count(1)
+
+
+@functools.cache
+def analysis_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """
+    the thread pool shared by AudioWave.analyse, ANALYSIS_WORKERS threads.
+    the reductions hold the GIL, the threads take them off the calling thread
+    but do not run them in parallel.
+    """
+    return concurrent.futures.ThreadPoolExecutor(
+        ANALYSIS_WORKERS, thread_name_prefix="audiowave"
+    )
+
+
+@functools.cache
+def analysis_processes() -> concurrent.futures.ProcessPoolExecutor:
+    """
+    a process pool of ANALYSIS_WORKERS processes for AudioWave.analyse, opted into
+    by passing it as the executor. the workers are spawned, a gui process and
+    its threads are never forked.
+    """
+    return concurrent.futures.ProcessPoolExecutor(
+        ANALYSIS_WORKERS, mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+def analyse_frames(
+    path: str,
+    channel: int,
+    start: int,
+    stop: int,
+    samples_per_pixel: int = 0,
+    spectrum: bool = False,
+) -> tuple[INTS, INTS, SAMPLES]:
+    """
+    AudioWave.channel_points of the frames start to stop of the wave file at path,
+    run in a worker process, which maps the file itself.
+    """
+    audioWave = AudioWave()
+    audioWave.open(path, mmap=True)
+    part = AudioWave()
+    part.open(
+        bytes=audioWave.frames(start, stop),
+        with_header=False,
+        channels=audioWave.channels,
+        sample_width=audioWave.sample_width,
+    )
+    part.frame_rate = audioWave.frame_rate
+    return part.channel_points(channel, samples_per_pixel, spectrum)
+
 
 class AudioWave:
+    # an AudioWaveCache, peaks of opened wave files are then kept on disk
+    cache: "AudioWaveCache" = None
+    # the shared memory budget of the derived arrays of every AudioWave
+    arrays = AudioWaveArrayCache()
+    # the executor of analyse, analysis_executor() when None
+    executor: concurrent.futures.Executor = None
+
+    DERIVED_ARRAYS = (
+        "array",
+        "channels_array",
+        "channels_min_max_array",
+        "channels_min_max_tupled_array",
+        "real_array",
+        "channels_real_array",
+        "channels_min_max_real_array",
+        "channels_min_max_tupled_real_array",
+        "channels_real_range",
+    )
+
     def __init__(
         self, byte_converter: typing.Callable[[bytes], int] = None, *args, **kwargs
     ):
 
         self.byte_converter = byte_converter
         self.__bytes = b""
+        self.__path = ""
+        self.__mmap: _mmap.mmap = None
         self.__sample_width = 0
+        self.__float_samples = False
+        # the registered codec of headerless bytes, the sample width's otherwise
+        self.__codec = ""
         self.__channels = 0
         self.__total_frames = 0
         self.__compression_name = ""
         self.__compression_type = ""
         self.__frame_rate = 0
 
-        self.__array: INTS = []
-        self.__channels_array: LIST_INTS = []
-        self.__channels_min_max_array: list[LIST_INTS] = []
-        self.__channels_min_max_tupled_array: list[LIST_TUPLED_INTS] = []
+        # an array given to open, not derived from the bytes
+        self.__source_array: SAMPLES = []
 
-        self.__real_array: INTS = []
-        self.__channels_real_array: LIST_INTS = []
-        self.__channels_min_max_real_array: list[LIST_INTS] = []
-        self.__channels_min_max_tupled_real_array: list[LIST_TUPLED_INTS] = []
+        self.__id = next(AUDIOWAVE_IDS)
+        weakref.finalize(self, self.arrays.discard, self.__id)
 
         if args or kwargs:
             self.open(*args, **kwargs)
 
     # scaling
 
-    def scale(self, array: INTS, scale: int) -> INTS_FLOATS:
+    def scale(
+        self,
+        array: SAMPLES,
+        scale: int,
+        mode: ScalingMode = ScalingMode.Linear,
+        channel: int = 0,
+    ) -> _array.array:
+        # relative to the cached peaks of the real channel if given
         self.check_array(array)
 
-        min_ = min(array)
-        max_ = max(array)
-
-        scaled_array: INTS_FLOATS = []
-
-        for point in array:
-            reference_point = min_ if point < 0 else max_
-            scale_factor = scale / reference_point
-            scaled_point = point * scale_factor
-            scaled_array.append(scaled_point)
+        if channel:
+            min_, max_ = self.channel_real_range(channel)
+        else:
+            min_, max_ = min(array), max(array)
 
-        return scaled_array
+        return scale_array(array, scale, min_, max_, mode)
 
     # sampling
 
-    def sample(self, array: INTS_FLOATS, samples: int):
+    def sample(self, array: SAMPLES, samples: int):
         self.check_array(array)
-        slicer = len(array) // samples
-        return array[::slicer]
+        return resample(array, samples)
+
+    @classmethod
+    def iter_peaks(
+        cls,
+        file: typing.Union[io.BufferedReader, str],
+        samples_per_pixel: int,
+        block_frames: int = PEAKS_BLOCK_FRAMES,
+        spectrum: bool = False,
+    ) -> typing.Iterator[list[TUPLED_INTS_FLOATS]]:
+        """
+        yields a (min, max, rms) tuple per channel for every samples_per_pixel frames,
+        reading the wave a block at a time.
+        spectrum appends the spectral_centroid of the frames to every tuple.
+        """
+        assert samples_per_pixel > 0, "samples_per_pixel is a positive integer"
+
+        # whole pixels per block, so no pixel straddles two blocks
+        pixels_per_block = max(block_frames // samples_per_pixel, 1)
+        block_frames = pixels_per_block * samples_per_pixel
+
+        _wave = wave.Wave_read(file)
+        try:
+            sample_width = _wave.getsampwidth()
+            channels = _wave.getnchannels()
+            frame_rate = _wave.getframerate()
+
+            while data := _wave.readframes(block_frames):
+                channels_array = deinterleave(decode_real(data, sample_width), channels)
+                frames = len(channels_array[0])
+
+                for start in range(0, frames, samples_per_pixel):
+                    stop = start + samples_per_pixel
+                    if spectrum:
+                        yield [
+                            peak(channel[start:stop])
+                            + (spectral_centroid(channel[start:stop], frame_rate),)
+                            for channel in channels_array
+                        ]
+                    else:
+                        yield [peak(channel[start:stop]) for channel in channels_array]
+        finally:
+            _wave.close()
+
+    def peaks(
+        self, samples_per_pixel: int, bits: int = 16, spectrum: bool = False
+    ) -> "AudioWavePeaks":
+        # spectrum derives the spectral centroid of every pixel along with its peaks
+        if self.cache and self.path:
+            derive = functools.partial(
+                self.derive_peaks, samples_per_pixel, bits, spectrum
+            )
+            return self.cache.peaks(
+                self.path, samples_per_pixel, bits, derive, spectrum
+            )
+        return self.derive_peaks(samples_per_pixel, bits, spectrum)
+
+    def derive_peaks(
+        self, samples_per_pixel: int, bits: int = 16, spectrum: bool = False
+    ) -> "AudioWavePeaks":
+        assert samples_per_pixel > 0, "samples_per_pixel is a positive integer"
+
+        codec = self.codec
+        channels_min_max = []
+        channels_centroids = []
+        for channel in self.channels_real_array:
+            if spectrum:
+                channels_centroids.append(
+                    spectral_centroids(channel, samples_per_pixel, self.frame_rate)
+                )
+            starts = range(0, len(channel), samples_per_pixel)
+            pixels = [channel[start : start + samples_per_pixel] for start in starts]
+            minimums = quantise(
+                map(min, pixels), codec.real_width, bits, codec.float_samples
+            )
+            maximums = quantise(
+                map(max, pixels), codec.real_width, bits, codec.float_samples
+            )
+            channels_min_max.append([minimums, maximums])
+
+        return AudioWavePeaks(
+            channels_min_max,
+            sample_rate=self.frame_rate,
+            samples_per_pixel=samples_per_pixel,
+            bits=bits,
+            channels_centroids=channels_centroids,
+        )
+
+    def save_peaks(self, file: str, samples_per_pixel: int, bits: int = 16):
+        self.peaks(samples_per_pixel, bits).save(file)
+
+    def silence(
+        self,
+        threshold: float = SILENCE_THRESHOLD,
+        min_seconds: float = SILENCE_SECONDS,
+        block_seconds: float = SILENCE_BLOCK_SECONDS,
+    ) -> "AudioWaveSilence":
+        if self.cache and self.path:
+            derive = functools.partial(
+                self.derive_silence, threshold, min_seconds, block_seconds
+            )
+            return self.cache.silence(
+                self.path, threshold, min_seconds, derive, block_seconds
+            )
+        return self.derive_silence(threshold, min_seconds, block_seconds)
+
+    def derive_silence(
+        self,
+        threshold: float = SILENCE_THRESHOLD,
+        min_seconds: float = SILENCE_SECONDS,
+        block_seconds: float = SILENCE_BLOCK_SECONDS,
+    ) -> "AudioWaveSilence":
+        assert self.frame_rate, "the frame rate is required to measure silence"
+        codec = self.codec
+        full_scale = 1 if codec.float_samples else 2 ** (codec.real_width * 8 - 1)
+        return AudioWaveSilence.detect(
+            self.channels_real_array,
+            full_scale * 10 ** (threshold / 20),
+            max(round(block_seconds * self.frame_rate), 1),
+            round(min_seconds * self.frame_rate),
+            self.frame_rate,
+        )
+
+    def analyse_channel(
+        self,
+        channel: int,
+        samples_per_pixel: int = 0,
+        channel_class: type["AudioWaveChannel"] = None,
+        spectrum: bool = False,
+        **kwargs,
+    ) -> "AudioWaveChannel":
+        """
+        an AudioWaveChannel of the real samples of channel with its averages, ranges
+        and pyramid derived, from the points of channel_points.
+        spectrum adds the spectral centroids of the points.
+        """
+        minimums, maximums, centroids = self.channel_points(
+            channel, samples_per_pixel, spectrum
+        )
+        if spectrum:
+            kwargs["centroids"] = centroids
+
+        channel_class = channel_class or AudioWaveChannel
+        return channel_class(minimums, maximums, **kwargs).analyse()
+
+    def channel_points(
+        self, channel: int, samples_per_pixel: int = 0, spectrum: bool = False
+    ) -> tuple[INTS, INTS, SAMPLES]:
+        """
+        the minimums, maximums and with spectrum the centroids of the points of
+        channel, the min, max pairs of channel_min_max_real_array or the extremes
+        of every samples_per_pixel samples.
+        """
+        centroids = None
+        if spectrum:
+            # a pair is too short for a frequency, each centroid of a window is
+            # repeated for its pairs
+            window = samples_per_pixel or spectrum_window(self.frame_rate)
+            centroids = spectral_centroids(
+                self.channel_real_array(channel), window, self.frame_rate
+            )
+        if samples_per_pixel:
+            samples = self.channel_real_array(channel)
+            starts = range(0, len(samples), samples_per_pixel)
+            stops = range(
+                samples_per_pixel, len(samples) + samples_per_pixel, samples_per_pixel
+            )
+            pixels = list(map(samples.__getitem__, map(slice, starts, stops)))
+            minimums, maximums = list(map(min, pixels)), list(map(max, pixels))
+        else:
+            minimums, maximums = map(list, self.channel_min_max_real_array(channel))
+            if spectrum:
+                pairs = map(itertools.repeat, centroids, itertools.repeat(window // 2))
+                centroids = _array.array(
+                    "B",
+                    itertools.islice(
+                        itertools.chain.from_iterable(pairs), len(minimums)
+                    ),
+                )
+
+        return minimums, maximums, centroids
+
+    def join_channel(
+        self,
+        parts: list[concurrent.futures.Future],
+        channel_class: type["AudioWaveChannel"] = None,
+        spectrum: bool = False,
+        **kwargs,
+    ) -> "AudioWaveChannel":
+        # the AudioWaveChannel of the channel_points of consecutive frames
+        points = [part.result() for part in parts]
+        minimums = list(itertools.chain.from_iterable(part[0] for part in points))
+        maximums = list(itertools.chain.from_iterable(part[1] for part in points))
+        if spectrum:
+            kwargs["centroids"] = _array.array(
+                "B", itertools.chain.from_iterable(part[2] for part in points)
+            )
+
+        channel_class = channel_class or AudioWaveChannel
+        return channel_class(minimums, maximums, **kwargs).analyse()
+
+    def frame_ranges(
+        self, samples_per_pixel: int = 0, spectrum: bool = False
+    ) -> list[TUPLED_INTS]:
+        # the (start, stop) frames every channel is split into for the worker
+        # processes, on whole points and spectrum windows
+        unit = samples_per_pixel or 2
+        if spectrum and not samples_per_pixel:
+            unit = spectrum_window(self.frame_rate)
+        parts = -(-ANALYSIS_WORKERS // self.channels)
+        frames = max(-(-self.total_frames // parts), ANALYSIS_FRAMES)
+        frames = -(-frames // unit) * unit
+        return [
+            (start, min(start + frames, self.total_frames))
+            for start in range(0, self.total_frames, frames)
+        ]
+
+    def analyse(
+        self,
+        samples_per_pixel: int = 0,
+        executor: concurrent.futures.Executor = None,
+        channel_class: type["AudioWaveChannel"] = None,
+        spectrum: bool = False,
+        **kwargs,
+    ) -> list[concurrent.futures.Future]:
+        """
+        analyse_channel of every channel at once, a future per channel, on
+        executor, AudioWave.executor or analysis_executor(). threads take the work
+        off the calling thread but are bound by the GIL, the samples are decoded
+        once, by whichever channel gets to them first.
+        a process pool such as analysis_processes() uses the cores in parallel, a
+        wave opened from a file is split by channel and frame_ranges across it,
+        each worker mapping the file itself, and joined on analysis_executor().
+        """
+        executor = executor or self.executor or analysis_executor()
+        if isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+            assert self.path, "a process pool analyses waves opened from a file"
+            processes = executor
+            ranges = self.frame_ranges(samples_per_pixel, spectrum)
+            return [
+                analysis_executor().submit(
+                    self.join_channel,
+                    [
+                        processes.submit(
+                            analyse_frames,
+                            self.path,
+                            channel,
+                            start,
+                            stop,
+                            samples_per_pixel,
+                            spectrum,
+                        )
+                        for start, stop in ranges
+                    ],
+                    channel_class,
+                    spectrum,
+                    **kwargs,
+                )
+                for channel in range(1, self.channels + 1)
+            ]
+
+        return [
+            executor.submit(
+                self.analyse_channel,
+                channel,
+                samples_per_pixel,
+                channel_class,
+                spectrum,
+                **kwargs,
+            )
+            for channel in range(1, self.channels + 1)
+        ]
 
     def save(self, name: str):
         if self.bytes:
@@ -86,49 +982,99 @@ class AudioWave:
         self,
         file: typing.Union[io.TextIOWrapper, str] = "",
         bytes: bytes = b"",
-        array: INTS = [],
+        array: SAMPLES = [],
         channels: int = 1,
         with_header: bool = True,
+        sample_width: int = 1,
+        float_samples: bool = False,
+        mmap: bool = False,
+        codec: str = "",
     ):
+        # sample_width and float_samples describe headerless bytes,
+        # wave files carry their own.
+        # codec names a registered format of headerless bytes instead of them.
+        # mmap maps the data chunk of a wave file instead of reading it,
+        # pages are only loaded when the frames are touched.
         self.clear()
         self.__channels = channels
+        self.__sample_width = sample_width
+        self.__float_samples = float_samples
+        self.__codec = ""
+
+        if codec and not (bytes and with_header):
+            _codec = get_codec(codec)
+            self.__codec = codec
+            self.__sample_width = _codec.sample_width
+            self.__float_samples = _codec.float_samples
 
         if bytes and with_header:
             file = io.BytesIO(bytes)
 
         if file:
+            if isinstance(file, str):
+                self.__path = file
             _wave = wave.Wave_read(file)
-            bytes = _wave._data_chunk.read()
+            mapped = self.map_data_chunk(file, _wave) if mmap else None
+            bytes = _wave._data_chunk.read() if mapped is None else mapped
             self.__sample_width = _wave.getsampwidth()
             self.__channels = _wave.getnchannels()
             self.__total_frames = _wave.getnframes()
             self.__compression_name = _wave.getcompname()
             self.__compression_type = _wave.getcomptype()
             self.__frame_rate = _wave.getframerate()
+            self.__float_samples = False
+            self.__codec = ""
 
         elif array:
-            self.__array = array
+            self.__source_array = array
+            self.__sample_width = 0
 
         self.__bytes = bytes
-        self.check_channel(self.channels)
+        self.check_channels(self.channels)
+
+    def map_data_chunk(
+        self, file: typing.Union[io.BufferedReader, str], _wave: wave.Wave_read
+    ) -> memoryview:
+        if isinstance(file, str):
+            with open(file, "rb") as _file:
+                self.__mmap = _mmap.mmap(_file.fileno(), 0, access=_mmap.ACCESS_READ)
+        else:
+            try:
+                fileno = file.fileno()
+            except (AttributeError, io.UnsupportedOperation):
+                return
+            self.__mmap = _mmap.mmap(fileno, 0, access=_mmap.ACCESS_READ)
+
+        data_chunk = _wave._data_chunk
+        start = _wave._file.offset + data_chunk.offset
+        stop = min(start + data_chunk.chunksize, len(self.__mmap))
+        return memoryview(self.__mmap)[start:stop]
 
     def clear(self):
         self.__bytes = b""
-        self.__array.clear()
-        self.__channels_array.clear()
-        self.__channels_min_max_array.clear()
-        self.__channels_min_max_tupled_array.clear()
+        self.__path = ""
+        self.__source_array = []
+        self.arrays.discard(self.__id)
+
+        if self.__mmap:
+            try:
+                self.__mmap.close()
+            except BufferError:
+                # views handed out still hold the map, it is unmapped
+                # once they are released
+                ...
+            self.__mmap = None
 
-        self.__real_array.clear()
-        self.__channels_real_array.clear()
-        self.__channels_min_max_real_array.clear()
-        self.__channels_min_max_tupled_real_array.clear()
+    def check_channels(self, channels: int):
+        assert channels > 0, "at least one channel is required"
 
-    def check_channel(self, channel):
-        assert channel in [1, 2], "channel 1 or 2 supported"
+    def check_channel(self, channel: int):
+        assert 0 < channel <= self.channels, f"channel 1 to {self.channels} supported"
 
     def check_array(self, array):
-        assert isinstance(array, list), f"array must be {INTS}"
+        assert isinstance(
+            array, (list, _array.array, memoryview)
+        ), f"array must be {SAMPLES}"
 
     @property
     def bits(self):
@@ -138,6 +1084,16 @@ class AudioWave:
     def sample_width(self):
         return self.__sample_width
 
+    @property
+    def float_samples(self):
+        return self.__float_samples
+
+    @property
+    def codec(self) -> AudioWaveCodec:
+        if self.__codec:
+            return get_codec(self.__codec)
+        return pcm_codec(self.sample_width, self.float_samples)
+
     @property
     def channels(self):
         return self.__channels
@@ -177,112 +1133,110 @@ class AudioWave:
     def bytes(self):
         return self.__bytes
 
-    # dynamic getters
-
-    # absolute values
-
     @property
-    def array(self) -> INTS:
-        if not self.__array:
-            byte_converter = None
-            if self.byte_converter:
-                try:
-                    self.byte_converter(self.bytes[0])
-                    byte_converter = self.byte_converter
-                except:
-                    ...
-
-            self.__array = [
-                byte_converter(i) if byte_converter else i for i in self.__bytes
-            ]
-        return self.__array
+    def path(self) -> str:
+        return self.__path
 
     @property
-    def channels_array(self) -> LIST_INTS:
-        if not self.__channels_array:
-            if self.channels == 1:
-                self.__channels_array = [self.array]
-
-            elif self.channels == 2:
-                channel_1: INTS = []
-                channel_2: INTS = []
+    def mapped(self) -> bool:
+        return self.__mmap is not None
 
-                count, length = 0, len(self.array)
-                while count < length:
-                    channel_1.extend(self.array[count : count + 2])
-                    count += 2
-                    channel_2.extend(self.array[count : count + 2])
-                    count += 2
+    @property
+    def frame_width(self):
+        return (self.sample_width or 1) * self.channels
 
-                self.__channels_array = [channel_1, channel_2]
+    def frames(self, start: int = 0, stop: int = None) -> memoryview:
+        frame_width = self.frame_width
+        stop = self.total_frames if stop is None else stop
+        return memoryview(self.__bytes)[start * frame_width : stop * frame_width]
 
-        return self.__channels_array
+    def frames_array(self, start: int = 0, stop: int = None) -> SAMPLES:
+        # interleaved samples of the frames, viewed in place when mapped
+        frames = self.frames(start, stop)
+        if self.mapped and not self.__codec:
+            return view(frames, self.sample_width, self.float_samples)
+        return self.codec.decode(frames)
 
-    @property
-    def channels_peaks(self) -> INTS:
-        return [max(channel) for channel in self.channels_array]
+    # dynamic getters
 
-    @property
-    def channels_min_max_array(self) -> list[LIST_INTS]:
-        if not self.__channels_min_max_array:
+    def cached(
+        self,
+        name: str,
+        derive: typing.Callable[[], typing.Any],
+        depends: tuple[str] = (),
+    ):
+        return self.arrays.get(self.__id, name, derive, depends)
+
+    def memory_usage(self) -> dict[str, int]:
+        # bytes held by the wave data and each derived array currently cached
+        usage = self.arrays.usage(self.__id)
+        memory_usage = {
+            # mapped pages belong to the file, not to the process
+            "bytes": sizeof(self.__bytes) if self.__bytes and not self.mapped else 0,
+            "source_array": sizeof(self.__source_array) if self.__source_array else 0,
+        }
+        memory_usage.update((name, usage.get(name, 0)) for name in self.DERIVED_ARRAYS)
+        memory_usage["total"] = sum(memory_usage.values())
+        return memory_usage
 
-            if self.channels == 1:
-                self.__channels_min_max_array = [
-                    [self.array[MIN_SLICE], self.array[MAX_SLICE]]
-                ]
+    # absolute values
 
-            elif self.channels == 2:
-                channel_1: LIST_INTS = [
-                    self.channels_array[0][MIN_SLICE],
-                    self.channels_array[0][MAX_SLICE],
-                ]
-                channel_2: LIST_INTS = [
-                    self.channels_array[1][MIN_SLICE],
-                    self.channels_array[1][MAX_SLICE],
-                ]
+    def __derive_array(self) -> SAMPLES:
+        if not self.__bytes:
+            return []
 
-                self.__channels_min_max_array = [channel_1, channel_2]
+        byte_converter = None
+        if self.byte_converter:
+            try:
+                self.byte_converter(self.bytes[0])
+                byte_converter = self.byte_converter
+            except:
+                ...
 
-        return self.__channels_min_max_array
+        if byte_converter:
+            return [byte_converter(i) for i in self.__bytes]
+        elif self.mapped and not self.__codec:
+            return view(self.__bytes, self.sample_width, self.float_samples)
+        return self.codec.decode(self.__bytes)
 
     @property
-    def channels_min_max_tupled_array(self) -> list[TUPLED_INTS]:
-        if not self.__channels_min_max_tupled_array:
+    def array(self) -> SAMPLES:
+        if self.__source_array:
+            return self.__source_array
+        return self.cached("array", self.__derive_array)
 
-            if self.channels == 1:
-                self.__channels_min_max_tupled_array = [
-                    list(
-                        zip(
-                            self.array[MIN_SLICE],
-                            self.array[MAX_SLICE],
-                        ),
-                    )
-                ]
-
-            elif self.channels == 2:
-                channel_1: LIST_TUPLED_INTS = list(
-                    zip(
-                        self.__channels_array[0][MIN_SLICE],
-                        self.__channels_array[0][MAX_SLICE],
-                    )
-                )
+    @property
+    def channels_array(self) -> LIST_SAMPLES:
+        return self.cached(
+            "channels_array",
+            lambda: deinterleave(self.array, self.channels),
+            ("array",),
+        )
 
-                channel_2: LIST_TUPLED_INTS = list(
-                    zip(
-                        self.__channels_array[1][MIN_SLICE],
-                        self.__channels_array[1][MAX_SLICE],
-                    )
-                )
+    @property
+    def channels_peaks(self) -> INTS_FLOATS:
+        return [max(channel) for channel in self.channels_array]
 
-                self.__channels_min_max_tupled_array = [channel_1, channel_2]
+    @property
+    def channels_min_max_array(self) -> list[LIST_SAMPLES]:
+        return self.cached(
+            "channels_min_max_array",
+            lambda: [deinterleave(channel, 2) for channel in self.channels_array],
+            ("channels_array",),
+        )
 
-        return self.__channels_min_max_tupled_array
+    @property
+    def channels_min_max_tupled_array(self) -> list[LIST_TUPLED_INTS]:
+        return self.cached(
+            "channels_min_max_tupled_array",
+            lambda: [list(zip(*min_max)) for min_max in self.channels_min_max_array],
+        )
 
-    def channel_array(self, channel: int) -> INTS:
+    def channel_array(self, channel: int) -> SAMPLES:
         self.check_channel(channel)
         return self.channels_array[channel - 1]
 
-    def channel_min_max_array(self, channel: int) -> LIST_INTS:
+    def channel_min_max_array(self, channel: int) -> LIST_SAMPLES:
         self.check_channel(channel)
         return self.channels_min_max_array[channel - 1]
 
@@ -290,11 +1244,11 @@ class AudioWave:
         self.check_channel(channel)
         return self.channels_min_max_tupled_array[channel - 1]
 
-    def channel_min_array(self, channel: int) -> INTS:
+    def channel_min_array(self, channel: int) -> SAMPLES:
         self.check_channel(channel)
         return self.channel_min_max_array(channel)[0]
 
-    def channel_max_array(self, channel: int) -> INTS:
+    def channel_max_array(self, channel: int) -> SAMPLES:
         self.check_channel(channel)
         return self.channel_min_max_array(channel)[1]
 
@@ -306,101 +1260,71 @@ class AudioWave:
         self.check_channel(channel)
         return self.channel_min_max_tupled_array(channel)[1]
 
-    # real array ranging from -128 to 127
+    # real array centered around 0, 8-bit samples range from -128 to 127
 
-    @property
-    def real_array(self) -> INTS:
-        if not self.__real_array:
-            self.__real_array = [i - 128 for i in self.array]
-        return self.__real_array
-
-    @property
-    def channels_real_array(self) -> LIST_INTS:
-        if not self.__channels_real_array:
-
-            if self.channels == 1:
-                self.__channels_real_array = [self.real_array]
+    def __derive_real_array(self) -> SAMPLES:
+        codec = self.codec
+        if not codec.decode_real:
+            array = self.array
+            return array if isinstance(array, list) else memoryview(array)
 
-            elif self.channels == 2:
-                channel_1: INTS = []
-                channel_2: INTS = []
+        elif self.__bytes and not self.byte_converter:
+            return codec.decode_real(self.__bytes)
 
-                count, length = 0, len(self.real_array)
-                while count < length:
-                    channel_1.extend(self.real_array[count : count + 2])
-                    count += 2
-                    channel_2.extend(self.real_array[count : count + 2])
-                    count += 2
-
-                self.__channels_real_array = [channel_1, channel_2]
-
-        return self.__channels_real_array
+        return [i - 128 for i in self.array]
 
     @property
-    def channels_real_peaks(self) -> INTS:
-        return [max(channel) for channel in self.channels_real_array]
+    def real_array(self) -> SAMPLES:
+        return self.cached("real_array", self.__derive_real_array, ("array",))
 
     @property
-    def channels_min_max_real_array(self) -> list[LIST_INTS]:
-        if not self.__channels_min_max_real_array:
-
-            if self.channels == 1:
-                self.__channels_min_max_real_array = [
-                    [self.real_array[MIN_SLICE], self.real_array[MAX_SLICE]]
-                ]
-
-            elif self.channels == 2:
-                channel_1: LIST_INTS = [
-                    self.channels_real_array[0][MIN_SLICE],
-                    self.channels_real_array[0][MAX_SLICE],
-                ]
-                channel_2: LIST_INTS = [
-                    self.channels_real_array[1][MIN_SLICE],
-                    self.channels_real_array[1][MAX_SLICE],
-                ]
-
-                self.__channels_min_max_real_array = [channel_1, channel_2]
-
-        return self.__channels_min_max_real_array
+    def channels_real_array(self) -> LIST_SAMPLES:
+        return self.cached(
+            "channels_real_array",
+            lambda: deinterleave(self.real_array, self.channels),
+            ("real_array",),
+        )
 
     @property
-    def channels_min_max_tupled_real_array(self) -> list[TUPLED_INTS]:
-        if not self.__channels_min_max_tupled_real_array:
-
-            if self.channels == 1:
-                self.__channels_min_max_tupled_real_array = [
-                    list(
-                        zip(
-                            self.real_array[MIN_SLICE],
-                            self.real_array[MAX_SLICE],
-                        ),
-                    )
-                ]
-
-            elif self.channels == 2:
-                channel_1: LIST_TUPLED_INTS = list(
-                    zip(
-                        self.channels_real_array[0][MIN_SLICE],
-                        self.channels_real_array[0][MAX_SLICE],
-                    )
-                )
+    def channels_real_peaks(self) -> INTS_FLOATS:
+        return [max_ for _, max_ in self.channels_real_range]
 
-                channel_2: LIST_TUPLED_INTS = list(
-                    zip(
-                        self.channels_real_array[1][MIN_SLICE],
-                        self.channels_real_array[1][MAX_SLICE],
-                    )
-                )
-
-                self.__channels_min_max_tupled_real_array = [channel_1, channel_2]
+    @property
+    def channels_real_range(self) -> LIST_TUPLED_INTS_FLOATS:
+        # (min, max) of each real channel
+        return self.cached(
+            "channels_real_range",
+            lambda: [
+                (min(channel), max(channel)) for channel in self.channels_real_array
+            ],
+        )
+
+    def channel_real_range(self, channel: int) -> TUPLED_INTS_FLOATS:
+        self.check_channel(channel)
+        return self.channels_real_range[channel - 1]
 
-        return self.__channels_min_max_tupled_real_array
+    @property
+    def channels_min_max_real_array(self) -> list[LIST_SAMPLES]:
+        return self.cached(
+            "channels_min_max_real_array",
+            lambda: [deinterleave(channel, 2) for channel in self.channels_real_array],
+            ("channels_real_array",),
+        )
 
-    def channel_real_array(self, channel: int) -> INTS:
+    @property
+    def channels_min_max_tupled_real_array(self) -> list[LIST_TUPLED_INTS]:
+        return self.cached(
+            "channels_min_max_tupled_real_array",
+            lambda: [
+                list(zip(*min_max)) for min_max in self.channels_min_max_real_array
+            ],
+        )
+
+    def channel_real_array(self, channel: int) -> SAMPLES:
         self.check_channel(channel)
         return self.channels_real_array[channel - 1]
 
-    def channel_min_max_real_array(self, channel: int) -> LIST_INTS:
+    def channel_min_max_real_array(self, channel: int) -> LIST_SAMPLES:
         self.check_channel(channel)
         return self.channels_min_max_real_array[channel - 1]
 
@@ -408,11 +1332,11 @@ class AudioWave:
         self.check_channel(channel)
         return self.channels_min_max_tupled_real_array[channel - 1]
 
-    def channel_min_real_array(self, channel: int) -> INTS:
+    def channel_min_real_array(self, channel: int) -> SAMPLES:
         self.check_channel(channel)
         return self.channel_min_max_real_array(channel)[0]
 
-    def channel_max_real_array(self, channel: int) -> INTS:
+    def channel_max_real_array(self, channel: int) -> SAMPLES:
         self.check_channel(channel)
         return self.channel_min_max_real_array(channel)[1]
 
@@ -428,6 +1352,212 @@ class AudioWave:
 class SamplingMethod(enum.Enum):
     Systematic = enum.auto()
     Cluster = enum.auto()
+    Pyramid = enum.auto()
+    # one reduction per pixel bucket over the whole array
+    MinMax = enum.auto()
+    Peak = enum.auto()
+    RMS = enum.auto()
+
+
+def mean(a: float, b: float) -> float:
+    return (a + b) / 2
+
+
+class AudioWavePyramid:
+    # levels[n] summarises 2 ** n samples per point, levels[0] being the data itself
+
+    LEVEL = struct.Struct("<I")
+
+    def __init__(self, minimums: SAMPLES, maximums: SAMPLES, averages: SAMPLES):
+        self.length = max(len(minimums), len(maximums), len(averages))
+
+        self.minimumsLevels = self.build(minimums, min)
+        self.maximumsLevels = self.build(maximums, max)
+        self.averagesLevels = self.build(averages, mean)
+
+    @staticmethod
+    def halve(values: SAMPLES, reducer: typing.Callable) -> _array.array:
+        evens, odds = values[MIN_SLICE], values[MAX_SLICE]
+        if reducer is mean:
+            pairs = map(operator.add, evens, odds)
+            halved = _array.array("d", map(operator.mul, pairs, itertools.repeat(0.5)))
+        else:
+            halved = _array.array("d", map(reducer, evens, odds))
+
+        if len(evens) > len(odds):
+            halved.append(evens[-1])
+        return halved
+
+    @classmethod
+    def build(cls, values: SAMPLES, reducer: typing.Callable) -> LIST_SAMPLES:
+        levels = [values]
+        while len(values) > 1:
+            values = cls.halve(values, reducer)
+            levels.append(values)
+        return levels
+
+    @classmethod
+    def extendLevels(
+        cls, levels: LIST_SAMPLES, values: SAMPLES, reducer: typing.Callable, start: int
+    ):
+        # only the points covering values[start:] are halved again, level by level
+        levels[0] = values
+        index = 0
+        while len(values) > 1:
+            # pairs start at even indices
+            start -= start % 2
+            tail = cls.halve(values[start:], reducer)
+            start //= 2
+            index += 1
+            if index < len(levels):
+                values = levels[index]
+                del values[start:]
+                values.extend(tail)
+            else:
+                values = tail
+                levels.append(values)
+
+    def extend(
+        self, minimums: SAMPLES, maximums: SAMPLES, averages: SAMPLES, start: int
+    ):
+        # the data grew from start on
+        self.length = max(len(minimums), len(maximums), len(averages))
+        self.extendLevels(self.minimumsLevels, minimums, min, start)
+        self.extendLevels(self.maximumsLevels, maximums, max, start)
+        self.extendLevels(self.averagesLevels, averages, mean, start)
+
+    def to_bytes(self) -> bytes:
+        # the levels above the data as little-endian doubles, each after its length
+        data = bytearray()
+        for levels in (self.minimumsLevels, self.maximumsLevels, self.averagesLevels):
+            data += self.LEVEL.pack(len(levels) - 1)
+            for level in levels[1:]:
+                level = _array.array("d", level)
+                if sys.byteorder == "big":
+                    level.byteswap()
+                data += self.LEVEL.pack(len(level)) + level.tobytes()
+        return bytes(data)
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes, minimums: SAMPLES, maximums: SAMPLES, averages: SAMPLES
+    ) -> "AudioWavePyramid":
+        # the levels of to_bytes above the data they were built from
+        pyramid = cls.__new__(cls)
+        pyramid.length = max(len(minimums), len(maximums), len(averages))
+
+        offset = 0
+        levels_of = []
+        for values in (minimums, maximums, averages):
+            (count,) = cls.LEVEL.unpack_from(data, offset)
+            offset += cls.LEVEL.size
+            levels = [values]
+            for _ in range(count):
+                (length,) = cls.LEVEL.unpack_from(data, offset)
+                offset += cls.LEVEL.size
+                stop = offset + length * 8
+                assert stop <= len(data), "the pyramid is truncated"
+                assert (
+                    length == (len(levels[-1]) + 1) // 2
+                ), "the pyramid is of other data"
+                levels.append(typed_array("d", data[offset:stop]))
+                offset = stop
+            levels_of.append(levels)
+
+        pyramid.minimumsLevels, pyramid.maximumsLevels, pyramid.averagesLevels = (
+            levels_of
+        )
+        return pyramid
+
+    def levelIndex(self, pixels: int) -> int:
+        # the coarsest level still holding at least a point per pixel
+        samplesPerPixel = self.length // pixels if pixels else 0
+        return max(samplesPerPixel.bit_length() - 1, 0)
+
+    def reduce(self, levels: LIST_SAMPLES, pixels: int, reducer: typing.Callable):
+        if not (levels[0] and pixels):
+            return []
+
+        level = levels[min(self.levelIndex(pixels), len(levels) - 1)]
+        length = len(level)
+        if length <= pixels:
+            return resample(level, pixels)
+
+        # every pixel covers one or two points of the level
+        bounds = sample_bounds(length, pixels)
+        if reducer is mean:
+            return [
+                sum(level[start:stop]) / (stop - start)
+                for start, stop in zip(bounds, bounds[1:])
+            ]
+        return [reducer(level[start:stop]) for start, stop in zip(bounds, bounds[1:])]
+
+    def minimums(self, pixels: int) -> FLOATS:
+        return self.reduce(self.minimumsLevels, pixels, min)
+
+    def maximums(self, pixels: int) -> FLOATS:
+        return self.reduce(self.maximumsLevels, pixels, max)
+
+    def averages(self, pixels: int) -> FLOATS:
+        return self.reduce(self.averagesLevels, pixels, mean)
+
+
+def window_bounds(start: int, stop: int, pixels: int) -> tuple[INTS, INTS]:
+    # the starts and stops of the buckets splitting start to stop into pixels
+    bounds = sample_bounds(stop - start, min(pixels, stop - start))
+    bounds = list(map(operator.add, bounds, itertools.repeat(start)))
+    return bounds[:-1], bounds[1:]
+
+
+class AudioWaveSparseTable:
+    # levels[k][i] reduces values[i : i + 2 ** k], any range is then reduced from
+    # the two power of two ranges overlapping it, in O(1) after O(n log n) building
+
+    def __init__(self, values: SAMPLES, reducer: typing.Callable = min):
+        self.reducer = reducer
+        self.length = len(values)
+        self.levels: LIST_SAMPLES = [values]
+
+        span = 1
+        while span * 2 <= self.length:
+            level = self.levels[-1]
+            self.levels.append(_array.array("d", map(reducer, level, level[span:])))
+            span *= 2
+
+    def query(self, start: int, stop: int) -> float:
+        # the reduction of values[start:stop]
+        assert 0 <= start < stop <= self.length, "a non empty range of the values"
+        level = (stop - start).bit_length() - 1
+        values = self.levels[level]
+        return self.reducer(values[start], values[stop - (1 << level)])
+
+    def queries(self, starts: INTS, stops: INTS) -> INTS_FLOATS:
+        # query of every start and stop, without a python loop
+        levels = list(
+            map(
+                operator.sub,
+                map(int.bit_length, map(operator.sub, stops, starts)),
+                itertools.repeat(1),
+            )
+        )
+        values = list(map(self.levels.__getitem__, levels))
+        seconds = map(
+            operator.sub, stops, map(operator.lshift, itertools.repeat(1), levels)
+        )
+        return list(
+            map(
+                self.reducer,
+                map(operator.getitem, values, starts),
+                map(operator.getitem, values, seconds),
+            )
+        )
+
+    def window(self, start: int, stop: int, pixels: int) -> INTS_FLOATS:
+        # a query per pixel of values[start:stop], interpolated up to pixels
+        if not (pixels and stop > start):
+            return []
+        points = self.queries(*window_bounds(start, stop, pixels))
+        return resample(points, pixels) if len(points) < pixels else points
 
 
 class AudioWaveChannel:
@@ -437,14 +1567,22 @@ class AudioWaveChannel:
         maximums: INTS = None,
         averages: INTS = None,
         averageDivisor: int = 1,
+        centroids: INTS = None,
     ):
         self.minimums = minimums or []
         self.maximums = maximums or []
         self._averages = averages or []
+        # spectral centroid of every point, 0 to 255 from low to high frequencies
+        self.centroids = centroids or []
         self.min: int = 0
         self.max: int = 0
         assert averageDivisor, "averageDivisor is a non-zero integer"
         self.averageDivisor = averageDivisor
+        self._pyramid: AudioWavePyramid = None
+        self._ranges: dict[str, TUPLED_INTS_FLOATS] = {}
+        self._envelopes: dict[tuple[str, int], FLOATS] = {}
+        # sparse tables of the minimums and maximums, prefix sums of the averages
+        self._tables: dict[str, typing.Any] = {}
 
     @property
     def averages(self):
@@ -456,21 +1594,144 @@ class AudioWaveChannel:
 
         return self._averages
 
+    @property
+    def pyramid(self) -> AudioWavePyramid:
+        if not self._pyramid:
+            self._pyramid = AudioWavePyramid(
+                self.minimums, self.maximums, self.averages
+            )
+        return self._pyramid
+
+    def arrayRange(self, name: str) -> TUPLED_INTS_FLOATS:
+        # cached (min, max) of the minimums, maximums or averages
+        if name not in self._ranges:
+            array = getattr(self, name)
+            self._ranges[name] = (min(array), max(array)) if array else (0, 0)
+        return self._ranges[name]
+
+    @property
+    def amplitudes(self) -> FLOATS:
+        # half the span of each min, max pair
+        if ("amplitudes", 0) not in self._envelopes:
+            spans = map(operator.add, map(abs, self.minimums), map(abs, self.maximums))
+            self._envelopes["amplitudes", 0] = list(
+                map(operator.mul, spans, itertools.repeat(0.5))
+            )
+        return self._envelopes["amplitudes", 0]
+
+    @staticmethod
+    def windowedRMS(amplitudes: SAMPLES, window: int, start: int = 0) -> FLOATS:
+        # rms over the trailing window points of each point from start on
+        base = max(start - window + 1, 0)
+        amplitudes = amplitudes[base:]
+        squares = list(
+            itertools.accumulate(map(operator.mul, amplitudes, amplitudes), initial=0)
+        )
+        stops = range(start - base + 1, len(amplitudes) + 1)
+        starts = list(
+            map(
+                max,
+                map(operator.sub, stops, itertools.repeat(window)),
+                itertools.repeat(0),
+            )
+        )
+        sums = map(
+            operator.sub,
+            map(squares.__getitem__, stops),
+            map(squares.__getitem__, starts),
+        )
+        means = map(operator.truediv, sums, map(operator.sub, stops, starts))
+        return list(map(math.sqrt, means))
+
+    @staticmethod
+    def decibels(values: SAMPLES, peak: float) -> FLOATS:
+        # dB relative to peak, no lower than DECIBEL_FLOOR
+        ratios = map(
+            max,
+            map(operator.truediv, values, itertools.repeat(peak or 1)),
+            itertools.repeat(1e-12),
+        )
+        decibels = map(operator.mul, map(math.log10, ratios), itertools.repeat(20))
+        return list(map(max, decibels, itertools.repeat(DECIBEL_FLOOR)))
+
+    def rmsEnvelope(self, window: int) -> FLOATS:
+        # rms of the amplitudes over the trailing window points of each point
+        assert window > 0, "window is a positive integer"
+        if ("rms", window) not in self._envelopes:
+            self._envelopes["rms", window] = self.windowedRMS(self.amplitudes, window)
+        return self._envelopes["rms", window]
+
+    def loudnessEnvelope(self, window: int) -> FLOATS:
+        # short term level of the rms envelope in dB below the loudest amplitude
+        if ("loudness", window) not in self._envelopes:
+            peak = self.arrayRange("amplitudes")[1]
+            self._envelopes["loudness", window] = self.decibels(
+                self.rmsEnvelope(window), peak
+            )
+        return self._envelopes["loudness", window]
+
+    def analyse(self) -> "AudioWaveChannel":
+        # derives the averages, ranges, amplitudes and pyramid ahead of painting
+        for name in ("minimums", "maximums", "averages", "amplitudes"):
+            self.arrayRange(name)
+        self.pyramid
+        return self
+
+    @property
+    def minimumsTable(self) -> AudioWaveSparseTable:
+        if "minimums" not in self._tables:
+            self._tables["minimums"] = AudioWaveSparseTable(self.minimums, min)
+        return self._tables["minimums"]
+
+    @property
+    def maximumsTable(self) -> AudioWaveSparseTable:
+        if "maximums" not in self._tables:
+            self._tables["maximums"] = AudioWaveSparseTable(self.maximums, max)
+        return self._tables["maximums"]
+
+    @property
+    def averagesSums(self) -> FLOATS:
+        if "averages" not in self._tables:
+            self._tables["averages"] = list(
+                itertools.accumulate(self.averages, initial=0)
+            )
+        return self._tables["averages"]
+
+    def rangeMinMax(self, start: int, stop: int) -> TUPLED_INTS_FLOATS:
+        # (min, max) of the points from start to stop, in O(1)
+        return (
+            self.minimumsTable.query(start, stop),
+            self.maximumsTable.query(start, stop),
+        )
+
+    def rangeAverage(self, start: int, stop: int) -> float:
+        sums = self.averagesSums
+        return (sums[stop] - sums[start]) / (stop - start)
+
+    def clearDerived(self):
+        self._tables = {}
+        self._pyramid = None
+        self._ranges = {}
+        self._envelopes = {}
+
     def setMinimums(self, minimums: INTS) -> bool:
         if minimums != self.minimums:
             self._averages.clear()
+            self.clearDerived()
             self.minimums = minimums
             return True
 
     def setMaximums(self, maximums: INTS) -> bool:
         if maximums != self.maximums:
             self._averages.clear()
+            self.clearDerived()
             self.maximums = maximums
             return True
 
     def setAverages(self, averages: INTS) -> bool:
         if averages != self.averages:
             self._averages.clear()
+            self.clearDerived()
             self._averages = averages
             return True
 
@@ -479,68 +1740,162 @@ class AudioWaveChannel:
         max = self.setMaximums(maximums)
         return min or max
 
+    def setCentroids(self, centroids: INTS) -> bool:
+        if centroids != self.centroids:
+            self.clearDerived()
+            self.centroids = centroids
+            return True
+
+    @staticmethod
+    def extended(values: SAMPLES, new: SAMPLES) -> SAMPLES:
+        # lists and double arrays grow in place, other storage once into a double array
+        if not (
+            isinstance(values, list)
+            or (isinstance(values, _array.array) and values.typecode == "d")
+        ):
+            values = _array.array("d", values)
+        values.extend(new)
+        return values
+
+    def append(self, minimums: INTS, maximums: INTS, centroids: INTS = None):
+        """
+        extends the data with the new pairs, updating the averages, the (min, max) ranges,
+        the envelopes and the pyramid only for the new points.
+        """
+        start = len(self.maximums)
+        if centroids:
+            self.centroids = self.extended(self.centroids, centroids)
+        self.minimums = self.extended(self.minimums, minimums)
+        self.maximums = self.extended(self.maximums, maximums)
+        new = dict(minimums=minimums, maximums=maximums)
+
+        if self._averages and len(self._averages) == start:
+            spans = map(operator.add, map(abs, minimums), map(abs, maximums))
+            new["averages"] = list(
+                map(operator.truediv, spans, itertools.repeat(self.averageDivisor))
+            )
+            self._averages = self.extended(self._averages, new["averages"])
+
+        if ("amplitudes", 0) in self._envelopes:
+            spans = map(operator.add, map(abs, minimums), map(abs, maximums))
+            new["amplitudes"] = list(map(operator.mul, spans, itertools.repeat(0.5)))
+            self._envelopes["amplitudes", 0].extend(new["amplitudes"])
+
+        peak = self._ranges.get("amplitudes", (0, 0))[1]
+        for name, (low, high) in list(self._ranges.items()):
+            if name not in new:
+                # not kept up to date, derived again on demand
+                del self._ranges[name]
+            elif values := new[name]:
+                self._ranges[name] = (min(low, min(values)), max(high, max(values)))
+
+        for kind, window in list(self._envelopes):
+            if kind == "rms":
+                self._envelopes[kind, window].extend(
+                    self.windowedRMS(self.amplitudes, window, start)
+                )
+        for kind, window in list(self._envelopes):
+            if kind != "loudness":
+                continue
+            if self._ranges.get("amplitudes", (0, 0))[1] == peak:
+                rms = self.rmsEnvelope(window)[start:]
+                self._envelopes[kind, window].extend(self.decibels(rms, peak))
+            else:
+                # a louder peak lowers every level
+                del self._envelopes[kind, window]
+
+        if self._pyramid:
+            self._pyramid.extend(self.minimums, self.maximums, self.averages, start)
+        # built again on demand
+        self._tables = {}
+
     def hasData(self) -> bool:
         return bool(self.minimums) or bool(self.maximums) or bool(self.averages)
 
     def systematicSample(self, array: INTS, width: int) -> INTS:
-        slicer = len(array) // width
-        return array[::slicer]
+        return resample(array, width)
 
     def clusterSample(self, array: INTS, width: int) -> INTS:
-        lastSamples = 0
-        nextSamples = width
-        samples = []
-
-        while True:
-            cluster = array[lastSamples:nextSamples]
-
-            lastSamples += width
-            nextSamples += width
-
-            if cluster:
-                pixel = sum(cluster) // width
-                samples.append(pixel)
-
-            else:
-                break
-
-        return samples
+        # width is the length of a cluster, the last one may be shorter
+        starts = range(0, len(array), width)
+        stops = range(width, len(array) + width, width)
+        clusters = list(map(array.__getitem__, map(slice, starts, stops)))
+        return list(map(operator.floordiv, map(sum, clusters), map(len, clusters)))
+
+    @staticmethod
+    def buckets(array: SAMPLES, width: int) -> LIST_SAMPLES:
+        # splits the array into width near equal buckets, all of them non empty
+        bounds = sample_bounds(len(array), min(width, len(array)))
+        return list(map(array.__getitem__, map(slice, bounds, bounds[1:])))
+
+    def minMaxSample(self, array: INTS, width: int, lowest: bool = False) -> INTS:
+        return list(map(min if lowest else max, self.buckets(array, width)))
+
+    def peakSample(self, array: INTS, width: int) -> INTS:
+        # the sample furthest from zero, with its sign
+        return list(map(functools.partial(max, key=abs), self.buckets(array, width)))
+
+    def rmsSample(self, array: INTS, width: int, lowest: bool = False) -> FLOATS:
+        buckets = self.buckets(array, width)
+        squares = map(sum, map(map, itertools.repeat(operator.mul), buckets, buckets))
+        rms = map(math.sqrt, map(operator.truediv, squares, map(len, buckets)))
+        # minimums sit below zero, so does their energy
+        return list(map(operator.neg, rms)) if lowest else list(rms)
 
     def sample(
         self,
         array: INTS,
         width: int,
         method: SamplingMethod = SamplingMethod.Systematic,
+        lowest: bool = False,
     ):
+        # lowest marks an array whose extremes are its minimums
+        if not array:
+            return []
+        if len(array) < width and method != SamplingMethod.Cluster:
+            # every point is a bucket of its own, interpolated up to width
+            return resample(self.sample(array, len(array), method, lowest), width)
         if method == SamplingMethod.Systematic:
             return self.systematicSample(array, width)
+        elif method == SamplingMethod.MinMax:
+            return self.minMaxSample(array, width, lowest)
+        elif method == SamplingMethod.Peak:
+            return self.peakSample(array, width)
+        elif method == SamplingMethod.RMS:
+            return self.rmsSample(array, width, lowest)
         else:
             return self.clusterSample(array, width)
 
     def averageSample(self, array: INTS, width: int):
-        slicer = len(array) // width
-        return array[::slicer]
-
-    def scale(self, array: INTS, height: int):
-        min_ = self.min or min(array)
-        max_ = self.max or max(array)
-        scaledArray: INTS_FLOATS = []
-        for point in array:
-            referencePoint = min_ if point < 0 else max_
-            scale_factor = height / referencePoint
-            scaled_point = point * scale_factor
-            scaledArray.append(scaled_point)
-        return scaledArray
+        return resample(array, width)
+
+    def scale(
+        self,
+        array: INTS,
+        height: int,
+        mode: ScalingMode = ScalingMode.Linear,
+        extremes: TUPLED_INTS_FLOATS = None,
+    ) -> _array.array:
+        # extremes is the (min, max) the points are relative to, the array's own by default
+        if not extremes:
+            extremes = (min(array), max(array)) if array else (0, 0)
+        min_ = self.min or extremes[0]
+        max_ = self.max or extremes[1]
+        return scale_array(array, height, min_, max_, mode)
 
     def sampleMinimums(
         self,
         samples: int,
         scale: int = 0,
         method: SamplingMethod = SamplingMethod.Systematic,
+        mode: ScalingMode = ScalingMode.Linear,
     ):
-        samples = self.sample(self.minimums, samples, method=method)
+        if method == SamplingMethod.Pyramid:
+            samples = self.pyramid.minimums(samples)
+        else:
+            samples = self.sample(self.minimums, samples, method=method, lowest=True)
         if scale:
-            samples = self.scale(samples, scale)
+            samples = self.scale(samples, scale, mode, self.arrayRange("minimums"))
         return samples
 
     def sampleMaximums(
@@ -548,10 +1903,14 @@ class AudioWaveChannel:
         samples: int,
         scale: int = 0,
         method: SamplingMethod = SamplingMethod.Systematic,
+        mode: ScalingMode = ScalingMode.Linear,
     ):
-        samples = self.sample(self.maximums, samples, method=method)
+        if method == SamplingMethod.Pyramid:
+            samples = self.pyramid.maximums(samples)
+        else:
+            samples = self.sample(self.maximums, samples, method=method)
         if scale:
-            samples = self.scale(samples, scale)
+            samples = self.scale(samples, scale, mode, self.arrayRange("maximums"))
         return samples
 
     def sampleAverages(
@@ -559,22 +1918,816 @@ class AudioWaveChannel:
         samples: int,
         scale: int = 0,
         method: SamplingMethod = SamplingMethod.Systematic,
+        mode: ScalingMode = ScalingMode.Linear,
     ):
-        samples = self.sample(self.averages, samples, method=method)
+        if method == SamplingMethod.Pyramid:
+            samples = self.pyramid.averages(samples)
+        else:
+            samples = self.sample(self.averages, samples, method=method)
         if scale:
-            samples = self.scale(samples, scale)
+            samples = self.scale(samples, scale, mode, self.arrayRange("averages"))
         return samples
 
+    def sampleRMS(
+        self,
+        samples: int,
+        scale: int = 0,
+        method: SamplingMethod = SamplingMethod.Systematic,
+        mode: ScalingMode = ScalingMode.Linear,
+        window: int = 8,
+        start: int = 0,
+        stop: int = 0,
+    ):
+        # the envelope of the points from start to stop alone when stop is given
+        if method == SamplingMethod.Pyramid:
+            method = SamplingMethod.MinMax
+        envelope = self.rmsEnvelope(window)
+        if stop:
+            envelope = envelope[start:stop]
+        samples = self.sample(envelope, samples, method=method)
+        if scale:
+            extremes = (0, self.arrayRange("amplitudes")[1])
+            samples = self.scale(samples, scale, mode, extremes)
+        return samples
+
+    def sampleLoudness(
+        self,
+        samples: int,
+        scale: int = 0,
+        method: SamplingMethod = SamplingMethod.Systematic,
+        window: int = 8,
+        start: int = 0,
+        stop: int = 0,
+    ):
+        # already logarithmic, so scaled linearly from DECIBEL_FLOOR up to 0 dB
+        if method == SamplingMethod.Pyramid:
+            method = SamplingMethod.MinMax
+        envelope = self.loudnessEnvelope(window)
+        if stop:
+            envelope = envelope[start:stop]
+        samples = self.sample(envelope, samples, method=method)
+        if scale:
+            levels = map(operator.sub, samples, itertools.repeat(DECIBEL_FLOOR))
+            samples = scale_array(list(levels), scale, 0, -DECIBEL_FLOOR)
+        return samples
+
+    def windowMinimums(
+        self,
+        start: int,
+        stop: int,
+        samples: int,
+        scale: int = 0,
+        mode: ScalingMode = ScalingMode.Linear,
+    ) -> INTS_FLOATS:
+        # the minimum of every pixel of the points from start to stop, a query each
+        samples = self.minimumsTable.window(start, stop, samples)
+        if scale:
+            samples = self.scale(samples, scale, mode, self.arrayRange("minimums"))
+        return samples
+
+    def windowMaximums(
+        self,
+        start: int,
+        stop: int,
+        samples: int,
+        scale: int = 0,
+        mode: ScalingMode = ScalingMode.Linear,
+    ) -> INTS_FLOATS:
+        samples = self.maximumsTable.window(start, stop, samples)
+        if scale:
+            samples = self.scale(samples, scale, mode, self.arrayRange("maximums"))
+        return samples
+
+    def windowAverages(
+        self,
+        start: int,
+        stop: int,
+        samples: int,
+        scale: int = 0,
+        mode: ScalingMode = ScalingMode.Linear,
+    ) -> INTS_FLOATS:
+        if not (samples and stop > start):
+            return []
+        sums = self.averagesSums
+        starts, stops = window_bounds(start, stop, samples)
+        totals = map(
+            operator.sub, map(sums.__getitem__, stops), map(sums.__getitem__, starts)
+        )
+        points = list(map(operator.truediv, totals, map(operator.sub, stops, starts)))
+        if len(points) < samples:
+            points = resample(points, samples)
+        if scale:
+            points = self.scale(points, scale, mode, self.arrayRange("averages"))
+        return points
+
+    def sampleCentroids(
+        self,
+        samples: int,
+        method: SamplingMethod = SamplingMethod.Systematic,
+        start: int = 0,
+        stop: int = 0,
+    ) -> INTS:
+        centroids = self.centroids[start:stop] if stop else self.centroids
+        if not centroids:
+            return []
+        if method == SamplingMethod.Systematic or len(centroids) < samples:
+            return list(map(round, resample(centroids, samples)))
+        # the mean centroid of every bucket
+        buckets = self.buckets(centroids, samples)
+        return list(map(operator.floordiv, map(sum, buckets), map(len, buckets)))
+
     def setBytes(self, bytes: bytes):
-        array = [i for i in bytes]
+        array = decode_u8(bytes)
+        self._averages = []
+        self.clearDerived()
         self.minimums = array[MIN_SLICE]
         self.maximums = array[MAX_SLICE]
 
     @classmethod
     def from_bytes(cls, bytes: bytes, *args, **kwargs):
-        array = [i for i in bytes]
+        array = decode_u8(bytes)
         return cls(array[MIN_SLICE], array[MAX_SLICE], *args, **kwargs)
 
+    @classmethod
+    def from_peaks(cls, file: str, channel: int = 1, *args, **kwargs):
+        return cls.from_audiowave_peaks(
+            AudioWavePeaks.load(file), channel, *args, **kwargs
+        )
+
+    @classmethod
+    def from_audiowave(
+        cls,
+        audioWave: AudioWave,
+        samples_per_pixel: int,
+        channel: int = 1,
+        bits: int = 16,
+        spectrum: bool = False,
+        *args,
+        **kwargs,
+    ):
+        # the points of AudioWave.peaks and their pyramid, read from its cache
+        # without decoding the wave when AudioWave.cache is set
+        peaks = audioWave.peaks(samples_per_pixel, bits, spectrum)
+        waveChannel = cls.from_audiowave_peaks(peaks, channel, *args, **kwargs)
+        if audioWave.cache and audioWave.path:
+            waveChannel._pyramid = audioWave.cache.pyramid(
+                audioWave.path, samples_per_pixel, bits, waveChannel, channel
+            )
+        return waveChannel
+
+    @classmethod
+    def from_audiowave_peaks(
+        cls, peaks: "AudioWavePeaks", channel: int = 1, *args, **kwargs
+    ):
+        minimums, maximums = peaks.channel_min_max(channel)
+        if peaks.channels_centroids:
+            kwargs.setdefault("centroids", peaks.channel_centroids(channel))
+        return cls(minimums, maximums, *args, **kwargs)
+
+    def sampleWidth(self) -> int:
+        # the narrowest sample width whose range holds the points
+        peak = max(-min(self.minimums, default=0), max(self.maximums, default=0))
+        for width in (1, 2, 3):
+            if peak <= 2 ** (width * 8 - 1):
+                return width
+        return 4
+
+    def savePeaks(
+        self,
+        file: str,
+        sample_rate: int = 0,
+        samples_per_pixel: int = 1,
+        bits: int = 16,
+        sample_width: int = 0,
+        float_samples: bool = False,
+    ):
+        # the points are quantised from sample_width, by default sampleWidth()
+        sample_width = sample_width or self.sampleWidth()
+        peaks = AudioWavePeaks(
+            [
+                [
+                    quantise(self.minimums, sample_width, bits, float_samples),
+                    quantise(self.maximums, sample_width, bits, float_samples),
+                ]
+            ],
+            sample_rate=sample_rate,
+            samples_per_pixel=samples_per_pixel,
+            bits=bits,
+            channels_centroids=[self.centroids] if self.centroids else None,
+        )
+        peaks.save(file)
+
+
+class AudioWavePeaks:
+    # the audiowaveform .dat and .json peak formats, see tests/assets/DataFormat.md
+
+    DAT_HEADER = struct.Struct("<iIiiI")
+    DAT_CHANNELS = struct.Struct("<i")
+    FLAG_8_BITS = 1
+
+    def __init__(
+        self,
+        channels_min_max: list[LIST_SAMPLES],
+        sample_rate: int = 0,
+        samples_per_pixel: int = 1,
+        bits: int = 16,
+        version: int = 0,
+        channels_centroids: LIST_SAMPLES = None,
+    ):
+        assert bits in (8, 16), "bits is either 8 or 16"
+        assert channels_min_max, "at least one channel is required"
+
+        self.channels_min_max = channels_min_max
+        # spectral centroids of every pixel, kept in .json files and .spectrum
+        # files next to the cached .dat files
+        self.channels_centroids = channels_centroids or []
+        self.sample_rate = sample_rate
+        self.samples_per_pixel = samples_per_pixel
+        self.bits = bits
+        # version 1 only holds a single channel
+        self.version = version or (1 if self.channels == 1 else 2)
+
+    @property
+    def channels(self) -> int:
+        return len(self.channels_min_max)
+
+    @property
+    def length(self) -> int:
+        return len(self.channels_min_max[0][0])
+
+    def channel_min_max(self, channel: int) -> LIST_SAMPLES:
+        assert 0 < channel <= self.channels, f"channel 1 to {self.channels} supported"
+        return self.channels_min_max[channel - 1]
+
+    def channel_centroids(self, channel: int) -> SAMPLES:
+        assert 0 < channel <= self.channels, f"channel 1 to {self.channels} supported"
+        return self.channels_centroids[channel - 1] if self.channels_centroids else []
+
+    def to_spectrum(self) -> bytes:
+        return b"".join(
+            _array.array("B", centroids).tobytes()
+            for centroids in self.channels_centroids
+        )
+
+    def read_spectrum(self, data: bytes):
+        # centroids written by to_spectrum, ignored unless a byte per pixel and channel
+        if len(data) == self.length * self.channels:
+            self.channels_centroids = [
+                _array.array("B", data[start : start + self.length])
+                for start in range(0, len(data), self.length)
+            ]
+
+    def interleaved(self) -> _array.array:
+        typecode = "b" if self.bits == 8 else "h"
+        step = self.channels * 2
+        interleaved = _array.array(
+            typecode, bytes(self.length * step * (self.bits // 8))
+        )
+
+        # the points are already of bits, quantise floors and clamps them alone
+        width = self.bits // 8
+        for index, (minimums, maximums) in enumerate(self.channels_min_max):
+            start = index * 2
+            interleaved[start::step] = quantise(minimums, width, self.bits)
+            interleaved[start + 1 :: step] = quantise(maximums, width, self.bits)
+
+        return interleaved
+
+    @classmethod
+    def deinterleaved(cls, data: SAMPLES, channels: int) -> list[LIST_SAMPLES]:
+        columns = deinterleave(data, channels * 2)
+        return [columns[index : index + 2] for index in range(0, len(columns), 2)]
+
+    # binary
+
+    def to_dat(self) -> bytes:
+        flags = self.FLAG_8_BITS if self.bits == 8 else 0
+        header = self.DAT_HEADER.pack(
+            self.version, flags, self.sample_rate, self.samples_per_pixel, self.length
+        )
+        if self.version > 1:
+            header += self.DAT_CHANNELS.pack(self.channels)
+
+        data = self.interleaved()
+        if sys.byteorder == "big":
+            data.byteswap()
+        return header + data.tobytes()
+
+    @classmethod
+    def from_dat(cls, data: bytes) -> "AudioWavePeaks":
+        version, flags, sample_rate, samples_per_pixel, length = (
+            cls.DAT_HEADER.unpack_from(data)
+        )
+        offset = cls.DAT_HEADER.size
+        channels = 1
+        if version > 1:
+            (channels,) = cls.DAT_CHANNELS.unpack_from(data, offset)
+            offset += cls.DAT_CHANNELS.size
+
+        bits = 8 if flags & cls.FLAG_8_BITS else 16
+        typecode = "b" if bits == 8 else "h"
+        size = length * channels * 2 * (bits // 8)
+        values = typed_array(typecode, data[offset : offset + size])
+
+        return cls(
+            cls.deinterleaved(values, channels),
+            sample_rate=sample_rate,
+            samples_per_pixel=samples_per_pixel,
+            bits=bits,
+            version=version,
+        )
+
+    # json
+
+    def to_json(self) -> dict:
+        json_ = dict(version=self.version)
+        if self.version > 1:
+            json_["channels"] = self.channels
+        json_.update(
+            sample_rate=self.sample_rate,
+            samples_per_pixel=self.samples_per_pixel,
+            bits=self.bits,
+            length=self.length,
+            data=self.interleaved().tolist(),
+        )
+        if self.channels_centroids:
+            json_["centroids"] = [
+                list(centroids) for centroids in self.channels_centroids
+            ]
+        return json_
+
+    @classmethod
+    def from_json(cls, json_: dict) -> "AudioWavePeaks":
+        bits = json_.get("bits", 16)
+        channels = json_.get("channels", 1)
+        values = _array.array("b" if bits == 8 else "h", json_["data"])
+
+        return cls(
+            cls.deinterleaved(values, channels),
+            sample_rate=json_.get("sample_rate", 0),
+            samples_per_pixel=json_.get("samples_per_pixel", 1),
+            bits=bits,
+            version=json_.get("version", 0),
+            channels_centroids=[
+                _array.array("B", centroids) for centroids in json_.get("centroids", [])
+            ],
+        )
+
+    # files, .json or .dat by the extension
+
+    @staticmethod
+    def is_json(file: str) -> bool:
+        return os.path.splitext(file)[1].lower() == ".json"
+
+    def save(self, file: str):
+        if self.is_json(file):
+            with open(file, "w") as _file:
+                json.dump(self.to_json(), _file)
+        else:
+            with open(file, "wb") as _file:
+                _file.write(self.to_dat())
+
+    @classmethod
+    def load(cls, file: str) -> "AudioWavePeaks":
+        if cls.is_json(file):
+            with open(file) as _file:
+                return cls.from_json(json.load(_file))
+        with open(file, "rb") as _file:
+            return cls.from_dat(_file.read())
+
+    @classmethod
+    def from_wave(
+        cls,
+        file: typing.Union[io.BufferedReader, str],
+        samples_per_pixel: int,
+        bits: int = 16,
+        spectrum: bool = False,
+    ) -> "AudioWavePeaks":
+        # streamed with AudioWave.iter_peaks, the audio is never fully decoded
+        with wave.open(file) as _wave:
+            sample_width = _wave.getsampwidth()
+            sample_rate = _wave.getframerate()
+            channels = _wave.getnchannels()
+        if not isinstance(file, str):
+            file.seek(0)
+
+        channels_min_max: list[LIST_SAMPLES] = [[[], []] for _ in range(channels)]
+        channels_centroids = (
+            [_array.array("B") for _ in range(channels)] if spectrum else []
+        )
+        pixels = AudioWave.iter_peaks(file, samples_per_pixel, spectrum=spectrum)
+        for pixel in pixels:
+            for (minimums, maximums), (min_, max_, *_) in zip(channels_min_max, pixel):
+                minimums.append(min_)
+                maximums.append(max_)
+            for centroids, (*_, centroid) in zip(channels_centroids, pixel):
+                centroids.append(centroid)
+
+        return cls(
+            [
+                [
+                    quantise(minimums, sample_width, bits),
+                    quantise(maximums, sample_width, bits),
+                ]
+                for minimums, maximums in channels_min_max
+            ],
+            sample_rate=sample_rate,
+            samples_per_pixel=samples_per_pixel,
+            bits=bits,
+            channels_centroids=channels_centroids,
+        )
+
+
+class AudioWaveSilence:
+    """
+    run-length index of the silent stretches of a wave, the sorted frames each run
+    starts and stops at, stops exclusive.
+    """
+
+    def __init__(
+        self,
+        starts: INTS,
+        stops: INTS,
+        frame_rate: int = 0,
+        total_frames: int = 0,
+    ):
+        assert len(starts) == len(stops), "a stop is required for every start"
+        self.starts = starts
+        self.stops = stops
+        self.frame_rate = frame_rate
+        self.total_frames = total_frames
+
+    @classmethod
+    def detect(
+        cls,
+        channels_array: LIST_SAMPLES,
+        threshold: float,
+        block_frames: int,
+        min_frames: int = 0,
+        frame_rate: int = 0,
+    ) -> "AudioWaveSilence":
+        """
+        blocks of block_frames frames whose peak is at most threshold in every channel
+        are silent, runs of them shorter than min_frames are not kept.
+        """
+        total_frames = len(channels_array[0]) if channels_array else 0
+        starts = range(0, total_frames, block_frames)
+        stops = range(block_frames, total_frames + block_frames, block_frames)
+
+        # the peak of every block, in the loudest channel
+        peaks = None
+        for channel in channels_array:
+            blocks = map(channel.__getitem__, map(slice, starts, stops))
+            channel_peaks = map(max, map(map, itertools.repeat(abs), blocks))
+            peaks = channel_peaks if peaks is None else map(max, peaks, channel_peaks)
+        silent = list(map(operator.le, peaks or (), itertools.repeat(threshold)))
+
+        # runs change state wherever silent does, every other run is silent
+        changes = itertools.compress(
+            range(1, len(silent)), map(operator.ne, silent[1:], silent)
+        )
+        edges = [0, *changes, len(silent)]
+        first = 0 if silent and silent[0] else 1
+        runs = zip(edges[first::2], edges[first + 1 :: 2])
+
+        run_starts, run_stops = [], []
+        for start, stop in runs:
+            start, stop = start * block_frames, min(stop * block_frames, total_frames)
+            if stop - start >= min_frames:
+                run_starts.append(start)
+                run_stops.append(stop)
+
+        return cls(run_starts, run_stops, frame_rate, total_frames)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def run(self, frame: int) -> TUPLED_INTS:
+        # the (start, stop) of the silent run holding frame, None when audible
+        index = bisect.bisect_right(self.starts, frame) - 1
+        if index >= 0 and frame < self.stops[index]:
+            return self.starts[index], self.stops[index]
+
+    def is_silent_frames(self, start: int, stop: int) -> bool:
+        run = self.run(start)
+        return bool(run) and stop <= run[1]
+
+    def is_silent(self, start: float, stop: float) -> bool:
+        # whether the seconds from start to stop are all silent, O(log n)
+        assert self.frame_rate, "the frame rate is required for seconds"
+        return self.is_silent_frames(
+            math.floor(start * self.frame_rate), math.ceil(stop * self.frame_rate)
+        )
+
+    def next_audible(self, frame: int) -> int:
+        run = self.run(frame)
+        return run[1] if run else frame
+
+    def audible_ranges(self, total_frames: int = 0) -> list[TUPLED_INTS]:
+        total_frames = total_frames or self.total_frames
+        edges = [0] + list(itertools.chain.from_iterable(zip(self.starts, self.stops)))
+        edges.append(total_frames)
+        return [
+            (start, stop)
+            for start, stop in zip(edges[0::2], edges[1::2])
+            if stop > start
+        ]
+
+    def audible(self, data: bytes, frame_width: int) -> bytes:
+        # the frames of data with the silent runs cut out
+        data = memoryview(data)
+        total_frames = len(data) // frame_width
+        return b"".join(
+            data[start * frame_width : stop * frame_width]
+            for start, stop in self.audible_ranges(total_frames)
+        )
+
+    def collapse(self, values: SAMPLES, frames_per_point: float, keep: int = 1) -> list:
+        """
+        the points of values, one every frames_per_point frames, with every silent
+        run shortened to keep points.
+        """
+        length = len(values)
+        point_starts, point_stops = [0], []
+        for start, stop in zip(self.starts, self.stops):
+            first = min(math.ceil(start / frames_per_point) + keep, length)
+            last = min(int(stop / frames_per_point), length)
+            if last > first:
+                point_stops.append(first)
+                point_starts.append(last)
+        point_stops.append(length)
+
+        slices = map(slice, point_starts, point_stops)
+        return list(itertools.chain.from_iterable(map(values.__getitem__, slices)))
+
+    # json
+
+    def to_json(self) -> dict:
+        return dict(
+            frame_rate=self.frame_rate,
+            total_frames=self.total_frames,
+            starts=list(self.starts),
+            stops=list(self.stops),
+        )
+
+    @classmethod
+    def from_json(cls, json_: dict) -> "AudioWaveSilence":
+        return cls(
+            json_["starts"],
+            json_["stops"],
+            json_.get("frame_rate", 0),
+            json_.get("total_frames", 0),
+        )
+
+    def save(self, file: str):
+        with open(file, "w") as _file:
+            json.dump(self.to_json(), _file)
+
+    @classmethod
+    def load(cls, file: str) -> "AudioWaveSilence":
+        with open(file) as _file:
+            return cls.from_json(json.load(_file))
+
+
+class AudioWaveCache:
+    # peaks of wave files kept as .dat files in directory, or in an .audiowave
+    # directory next to each wave when no directory is given, their spectral
+    # centroids if any in .spectrum files of the same name.
+    # entries are keyed by path, size, mtime and a hash of the head and tail
+    # of the file, written atomically and evicted least recently used first
+    # once a directory outgrows max_bytes, so without a directory every sidecar
+    # directory has a budget of max_bytes of its own.
+    # the pyramids of the channels built from them are kept in .pyramid files.
+    # peaks hashes the key once for the paths of get and put, key hashes a file
+    # once per size and mtime.
+
+    SIDECAR_DIRECTORY = ".audiowave"
+
+    def __init__(self, directory: str = "", max_bytes: int = CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def directory_of(self, file: str) -> str:
+        if self.directory:
+            return self.directory
+        return os.path.join(
+            os.path.dirname(os.path.abspath(file)), self.SIDECAR_DIRECTORY
+        )
+
+    @classmethod
+    def key(cls, file: str) -> str:
+        # a stat per call, the file is hashed once per size and mtime
+        stat = os.stat(file)
+        return cls.digest(os.path.abspath(file), stat.st_size, stat.st_mtime_ns)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def digest(file: str, size: int, mtime_ns: int) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(file.encode())
+        digest.update(f"{size}:{mtime_ns}".encode())
+
+        with open(file, "rb") as _file:
+            digest.update(_file.read(CACHE_HASH_BYTES))
+            if size > CACHE_HASH_BYTES:
+                _file.seek(max(size - CACHE_HASH_BYTES, CACHE_HASH_BYTES))
+                digest.update(_file.read())
+
+        return digest.hexdigest()
+
+    EXTENSIONS = (".dat", ".spectrum", ".silence", ".pyramid")
+
+    def path(
+        self,
+        file: str,
+        samples_per_pixel: int,
+        bits: int = 16,
+        extension: str = ".dat",
+        key: str = "",
+    ) -> str:
+        name = f"{key or self.key(file)}-{samples_per_pixel}-{bits}{extension}"
+        return os.path.join(self.directory_of(file), name)
+
+    def get(
+        self, file: str, samples_per_pixel: int, bits: int = 16, key: str = ""
+    ) -> "AudioWavePeaks":
+        key = key or self.key(file)
+        path = self.path(file, samples_per_pixel, bits, key=key)
+        try:
+            with open(path, "rb") as _file:
+                peaks = AudioWavePeaks.from_dat(_file.read())
+            # the modification time orders the eviction
+            os.utime(path)
+        except (OSError, struct.error, AssertionError):
+            return
+
+        spectrum = self.path(file, samples_per_pixel, bits, ".spectrum", key)
+        try:
+            with open(spectrum, "rb") as _file:
+                peaks.read_spectrum(_file.read())
+            os.utime(spectrum)
+        except OSError:
+            ...
+        return peaks
+
+    def pyramid(
+        self,
+        file: str,
+        samples_per_pixel: int,
+        bits: int,
+        waveChannel: "AudioWaveChannel",
+        channel: int = 1,
+    ) -> AudioWavePyramid:
+        # the pyramid of waveChannel, a channel of the peaks of file, read from
+        # a .pyramid file of its own or built and written
+        extension = f"-{channel}-{waveChannel.averageDivisor:g}.pyramid"
+        path = self.path(file, samples_per_pixel, bits, extension)
+        try:
+            with open(path, "rb") as _file:
+                pyramid = AudioWavePyramid.from_bytes(
+                    _file.read(),
+                    waveChannel.minimums,
+                    waveChannel.maximums,
+                    waveChannel.averages,
+                )
+            os.utime(path)
+            return pyramid
+        except (OSError, struct.error, AssertionError):
+            ...
+
+        pyramid = waveChannel.pyramid
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        self.write(path, pyramid.to_bytes())
+        self.evict(directory)
+        return pyramid
+
+    def silence_path(
+        self,
+        file: str,
+        threshold: float,
+        min_seconds: float,
+        block_seconds: float = SILENCE_BLOCK_SECONDS,
+    ) -> str:
+        name = (
+            f"{self.key(file)}-silence{threshold:g}-{min_seconds:g}-{block_seconds:g}"
+            ".silence"
+        )
+        return os.path.join(self.directory_of(file), name)
+
+    def silence(
+        self,
+        file: str,
+        threshold: float = SILENCE_THRESHOLD,
+        min_seconds: float = SILENCE_SECONDS,
+        derive: typing.Callable[[], "AudioWaveSilence"] = None,
+        block_seconds: float = SILENCE_BLOCK_SECONDS,
+    ) -> "AudioWaveSilence":
+        path = self.silence_path(file, threshold, min_seconds, block_seconds)
+        try:
+            with open(path) as _file:
+                silence = AudioWaveSilence.from_json(json.load(_file))
+            os.utime(path)
+            return silence
+        except (OSError, ValueError, KeyError, AssertionError):
+            ...
+
+        if derive:
+            silence = derive()
+        else:
+            audiowave = AudioWave(file=file)
+            silence = audiowave.derive_silence(threshold, min_seconds, block_seconds)
+            audiowave.clear()
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        self.write(path, json.dumps(silence.to_json()).encode())
+        self.evict(directory)
+        return silence
+
+    @staticmethod
+    def write(path: str, data: bytes):
+        # a temporary file replacing path, readers never see a partial file
+        directory = os.path.dirname(path)
+        fd, temp = tempfile.mkstemp(suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as _file:
+                _file.write(data)
+            os.replace(temp, path)
+        except OSError:
+            if os.path.exists(temp):
+                os.remove(temp)
+            raise
+
+    def put(self, file: str, peaks: "AudioWavePeaks", key: str = ""):
+        key = key or self.key(file)
+        path = self.path(file, peaks.samples_per_pixel, peaks.bits, key=key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        self.write(path, peaks.to_dat())
+        if peaks.channels_centroids:
+            spectrum = self.path(
+                file, peaks.samples_per_pixel, peaks.bits, ".spectrum", key
+            )
+            self.write(spectrum, peaks.to_spectrum())
+
+        self.evict(directory)
+
+    def peaks(
+        self,
+        file: str,
+        samples_per_pixel: int,
+        bits: int = 16,
+        derive: typing.Callable[[], "AudioWavePeaks"] = None,
+        spectrum: bool = False,
+    ) -> "AudioWavePeaks":
+        key = self.key(file)
+        peaks = self.get(file, samples_per_pixel, bits, key)
+        if not peaks or (spectrum and not peaks.channels_centroids):
+            if derive:
+                peaks = derive()
+            else:
+                peaks = AudioWavePeaks.from_wave(
+                    file, samples_per_pixel, bits, spectrum
+                )
+            self.put(file, peaks, key)
+        return peaks
+
+    def entries(self, directory: str) -> list[tuple[str, os.stat_result]]:
+        entries = []
+        with os.scandir(directory) as scanned:
+            for entry in scanned:
+                if entry.name.endswith(self.EXTENSIONS):
+                    try:
+                        entries.append((entry.path, entry.stat()))
+                    except FileNotFoundError:
+                        ...
+        return entries
+
+    def evict(self, directory: str):
+        entries = self.entries(directory)
+        size = sum(stat.st_size for _, stat in entries)
+
+        for path, stat in sorted(entries, key=lambda entry: entry[1].st_mtime_ns):
+            if size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # evicted by another process
+                ...
+            size -= stat.st_size
+
+    def clear(self, file: str = ""):
+        directory = self.directory_of(file) if file else self.directory
+        if directory and os.path.isdir(directory):
+            for path, _ in self.entries(directory):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    ...
+
 
 if __name__ == "__main__":
 
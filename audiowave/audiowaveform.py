@@ -1,4 +1,4 @@
-import enum, math, typing
+import collections, enum, functools, itertools, math, typing
 from PySide6.QtGui import *
 from PySide6.QtCore import *
 from PySide6.QtWidgets import QWidget, QFrame
@@ -11,6 +11,8 @@ class AudioWaveFormGravity(enum.Enum):
     Max_Min = Min_Max
     Min = enum.auto()
     Max = enum.auto()
+    RMS = enum.auto()
+    Loudness = enum.auto()
 
 
 COLORS = typing.Union[Qt.GlobalColor, QColor]
@@ -37,6 +39,11 @@ class AudioWaveFormOptions:
         seekerColor: COLORS = Qt.transparent,
         seekerRadius: int = 5,
         gravity: AudioWaveFormGravity = AudioWaveFormGravity.Min_Max,
+        samplingMethod: SamplingMethod = SamplingMethod.Systematic,
+        scalingMode: ScalingMode = ScalingMode.Linear,
+        envelopeWindow: int = 8,
+        spectrumColors: tuple[COLORS, COLORS, COLORS] = None,
+        collapseSilence: bool = False,
     ):
         self.visible = visible
         self.background = background
@@ -56,6 +63,14 @@ class AudioWaveFormOptions:
         self.seekColor = seekColor
         self.seekerColor = seekerColor
         self.seekerRadius = seekerRadius
+        self.samplingMethod = samplingMethod
+        self.scalingMode = scalingMode
+        self.envelopeWindow = envelopeWindow
+        # low, mid and high frequency colors of the bars, by their spectral centroid
+        self.spectrumColors = spectrumColors
+        self._spectrumPalette: list[QColor] = []
+        # draws the silent runs of the channel's silence a bar long
+        self.collapseSilence = collapseSilence
 
         self.channel: AudioWaveFormChannel = None
 
@@ -159,13 +174,76 @@ class AudioWaveFormOptions:
             self.seekerRadius = seekerRadius
             self.updateChannel()
 
+    def setSamplingMethod(self, samplingMethod: SamplingMethod) -> None:
+        if samplingMethod != self.samplingMethod:
+            self.samplingMethod = samplingMethod
+            self.updateChannel()
+
+    def setScalingMode(self, scalingMode: ScalingMode) -> None:
+        if scalingMode != self.scalingMode:
+            self.scalingMode = scalingMode
+            self.updateChannel()
+
+    def spectrumPalette(self) -> list[QColor]:
+        # a color per spectral centroid, from the low through the mid to the high color
+        if self.spectrumColors and not self._spectrumPalette:
+            low, mid, high = map(QColor, self.spectrumColors)
+            for centroid in range(256):
+                ratio = centroid / 255 * 2
+                if ratio <= 1:
+                    start, stop = low, mid
+                else:
+                    start, stop, ratio = mid, high, ratio - 1
+                self._spectrumPalette.append(
+                    QColor.fromRgbF(
+                        start.redF() + (stop.redF() - start.redF()) * ratio,
+                        start.greenF() + (stop.greenF() - start.greenF()) * ratio,
+                        start.blueF() + (stop.blueF() - start.blueF()) * ratio,
+                        start.alphaF() + (stop.alphaF() - start.alphaF()) * ratio,
+                    )
+                )
+        return self._spectrumPalette
+
+    def setSpectrumColors(self, spectrumColors: tuple[COLORS, COLORS, COLORS]) -> None:
+        if spectrumColors != self.spectrumColors:
+            self.spectrumColors = spectrumColors
+            self._spectrumPalette = []
+            self.updateChannel()
+
+    def setCollapseSilence(self, collapseSilence: bool) -> None:
+        if collapseSilence != self.collapseSilence:
+            self.collapseSilence = collapseSilence
+            self.updateChannel()
+
+    def setEnvelopeWindow(self, envelopeWindow: int) -> None:
+        if envelopeWindow != self.envelopeWindow:
+            self.envelopeWindow = envelopeWindow
+            self.updateChannel()
+
 
 DEFAULT_WAVEFORM_OPTIONS = AudioWaveFormOptions()
+SAMPLED_ARRAYS = 8
+# rounded rect paths and masks kept by RoundedPolygon.template and .mask
+PATH_TEMPLATES = 1024
+# the least bars of a shape and color stamped from a tinted mask, fewer are filled
+# as one path with the rest of their color
+TINTED_BARS = 4
 
 
 class AudioWaveFormChannel(AudioWaveChannel):
     def __init__(self, *args, options: AudioWaveFormOptions = None, **kwargs):
+        # bumped on every change of the data or the options, keys the painted layer
+        self.version = 0
+        # sampled and scaled points per paint configuration, least recently used first
+        self.sampledArrays: collections.OrderedDict[tuple, SAMPLES] = (
+            collections.OrderedDict()
+        )
         super().__init__(*args, **kwargs)
+        self.silence: AudioWaveSilence = None
+        # the (start, stop) of the points painted, all of them when None
+        self.view: TUPLED_INTS = None
+        self.framesPerPoint: float = 1
+        self._collapsed: AudioWaveChannel = None
         self.options: AudioWaveFormOptions = None
         self.waveForm: AudioWaveForm = None
         self.setOptions(options)
@@ -178,6 +256,121 @@ class AudioWaveFormChannel(AudioWaveChannel):
         self.options.channel = self
         self.updateWaveForm()
 
+    def clearDerived(self):
+        super().clearDerived()
+        self.clearSampled()
+
+    def clearSampled(self):
+        # the copies of the points as painted, for changed data or silence
+        self.sampledArrays.clear()
+        self._collapsed = None
+        self.version += 1
+
+    def setSilence(self, silence: AudioWaveSilence, framesPerPoint: float, up=True):
+        # framesPerPoint is the frames of the wave every point of the data covers
+        self.silence = silence
+        self.framesPerPoint = framesPerPoint
+        self.clearDerived()
+        if up:
+            self.updateWaveForm()
+
+    def setView(self, start: int = 0, stop: int = 0, up=True):
+        # paints the points from start to stop alone, a range query per pixel,
+        # every point again when stop is 0
+        view = (start, stop) if stop > start else None
+        if view != self.view:
+            self.view = view
+            self.version += 1
+            if up:
+                self.updateWaveForm()
+
+    def collapsed(self) -> AudioWaveChannel:
+        # the data with its silent runs a point long
+        if not self._collapsed:
+            collapse = functools.partial(
+                self.silence.collapse, frames_per_point=self.framesPerPoint
+            )
+            self._collapsed = AudioWaveChannel(
+                collapse(self.minimums),
+                collapse(self.maximums),
+                collapse(self.averages),
+                centroids=collapse(self.centroids),
+            )
+            self._collapsed.min = self.min
+            self._collapsed.max = self.max
+        return self._collapsed
+
+    def sampled(self, name: str, pixels: int, scale: int) -> SAMPLES:
+        # the points of minimums, maximums, averages, rms, loudness or centroids
+        # as painted
+        options = self.options
+        method = options.samplingMethod
+        mode = options.scalingMode
+        window = options.envelopeWindow
+        key = (
+            name,
+            pixels,
+            scale,
+            method,
+            mode,
+            window,
+            options.zoom,
+            options.gravity,
+            self.min,
+            self.max,
+            options.collapseSilence,
+            self.view,
+        )
+
+        if key in self.sampledArrays:
+            self.sampledArrays.move_to_end(key)
+            return self.sampledArrays[key]
+
+        channel = self
+        start = stop = 0
+        if self.view:
+            # every array of the view is of the points as they are
+            start, stop = self.view
+        elif options.collapseSilence and self.silence:
+            channel = self.collapsed()
+
+        if self.view and name in ("minimums", "maximums", "averages"):
+            if name == "minimums":
+                points = self.windowMinimums(start, stop, pixels, scale, mode)
+            elif name == "maximums":
+                points = self.windowMaximums(start, stop, pixels, scale, mode)
+            else:
+                points = self.windowAverages(start, stop, pixels, scale, mode)
+        elif name == "minimums":
+            points = channel.sampleMinimums(pixels, scale, method=method, mode=mode)
+        elif name == "maximums":
+            points = channel.sampleMaximums(pixels, scale, method=method, mode=mode)
+        elif name == "averages":
+            points = channel.sampleAverages(pixels, scale, method=method, mode=mode)
+        elif name == "centroids":
+            points = channel.sampleCentroids(
+                pixels, method=method, start=start, stop=stop
+            )
+        elif name == "rms":
+            points = channel.sampleRMS(
+                pixels,
+                scale,
+                method=method,
+                mode=mode,
+                window=window,
+                start=start,
+                stop=stop,
+            )
+        else:
+            points = channel.sampleLoudness(
+                pixels, scale, method=method, window=window, start=start, stop=stop
+            )
+
+        self.sampledArrays[key] = points
+        while len(self.sampledArrays) > SAMPLED_ARRAYS:
+            self.sampledArrays.popitem(last=False)
+        return points
+
     def setMinimums(self, minimums: INTS, up=True):
         if super().setMinimums(minimums) and up:
             self.updateWaveForm()
@@ -194,11 +387,42 @@ class AudioWaveFormChannel(AudioWaveChannel):
         if super().setMinMax(minimums, maximums) and up:
             self.updateWaveForm()
 
+    def setCentroids(self, centroids: INTS, up=True):
+        if super().setCentroids(centroids) and up:
+            self.updateWaveForm()
+
+    def append(self, minimums: INTS, maximums: INTS, centroids: INTS = None, up=True):
+        super().append(minimums, maximums, centroids)
+        self.clearSampled()
+        if (minimums or maximums) and up:
+            self.updateWaveForm()
+
+    def scroll(self, minimums: INTS, maximums: INTS, points: int = 1, up=True):
+        # sets the points moved left by points with new ones at the end, the
+        # waveForm scrolls the bars it painted instead of painting them all again
+        shifted = (
+            0 < points < len(minimums)
+            and len(minimums) == len(self.minimums or [])
+            and minimums[:-points] == self.minimums[points:]
+            and maximums[:-points] == self.maximums[points:]
+        )
+        version = self.version
+        # the setters of AudioWaveChannel, the ones here paint the waveForm whole
+        changed = AudioWaveChannel.setMinimums(self, minimums)
+        if not (AudioWaveChannel.setMaximums(self, maximums) or changed):
+            return
+
+        if up and shifted and self.waveForm:
+            self.waveForm.scrollChannel(self, version, points)
+        elif up:
+            self.updateWaveForm()
+
     @classmethod
     def from_bytes(cls, bytes: bytes, options: AudioWaveFormOptions):
         return super().from_bytes(bytes, options=options)
 
     def updateWaveForm(self):
+        self.version += 1
         if self.waveForm:
             self.waveForm.update()
 
@@ -207,6 +431,10 @@ class AudioWaveFormChannel(AudioWaveChannel):
         self.updateWaveForm()
 
 
+def qRound(value: float) -> int:
+    return int(value + 0.5) if value >= 0 else int(value - 0.5)
+
+
 class RoundedPolygon(QPolygon):
     def __init__(self, radius: int):
         super().__init__()
@@ -258,21 +486,133 @@ class RoundedPolygon(QPolygon):
         return path
 
     @classmethod
-    def get_path(cls, radius: int, rect: typing.Union[QRect, QRectF]):
-        point = lambda p: p.toPoint() if isinstance(p, QPointF) else p
-
+    @functools.lru_cache(maxsize=PATH_TEMPLATES)
+    def template(cls, radius: int, width: int, height: int) -> QPainterPath:
+        # the path of a rect at the origin, bars differ in their height and x alone
         poly = cls(radius)
-        (
-            poly
-            << point(rect.topLeft())
-            << point(rect.topRight())
-            << point(rect.bottomRight())
-            << point(rect.bottomLeft())
-        )
+        poly << QPoint(0, 0) << QPoint(width, 0)
+        poly << QPoint(width, height) << QPoint(0, height)
         return poly.path()
 
+    @classmethod
+    @functools.lru_cache(maxsize=PATH_TEMPLATES)
+    def mask(cls, radius: int, width: int, height: int, ratio: float) -> QPixmap:
+        # the coverage of the template in its alpha, tinted by .sprite for any color
+        size = QSizeF(width + 1, height + 1) * ratio
+        mask = QPixmap(math.ceil(size.width()), math.ceil(size.height()))
+        mask.setDevicePixelRatio(ratio)
+        mask.fill(Qt.transparent)
+
+        painter = QPainter(mask)
+        painter.fillPath(cls.template(radius, width, height), Qt.black)
+        painter.end()
+        return mask
+
+    @classmethod
+    def sprite(
+        cls, radius: int, width: int, height: int, color: QColor, ratio: float
+    ) -> QPixmap:
+        # the filled template, stamped instead of filling a path for every bar
+        sprite = QPixmap(cls.mask(radius, width, height, ratio))
+        painter = QPainter(sprite)
+        painter.setCompositionMode(QPainter.CompositionMode_SourceIn)
+        painter.fillRect(sprite.rect(), color)
+        painter.end()
+        return sprite
+
+    @staticmethod
+    def bounds(rect: typing.Union[QRect, QRectF]) -> tuple[int, int, int, int]:
+        # the x, y, width and height of the polygon of the rect, its corners
+        # rounded as QPointF.toPoint does
+        x, y, width, height = rect.getRect()
+        if isinstance(rect, QRect):
+            return x, y, width - 1, height - 1
+
+        left, top = qRound(x), qRound(y)
+        return left, top, qRound(x + width) - left, qRound(y + height) - top
+
+    @classmethod
+    def get_path(cls, radius: int, rect: typing.Union[QRect, QRectF]):
+        x, y, width, height = cls.bounds(rect)
+        return cls.template(radius, width, height).translated(x, y)
+
+
+# a color, its square bars and the top left points of its rounded bars per shape
+BAR_GROUP = tuple[COLORS, list[QRectF], dict[TUPLED_INTS, LIST_TUPLED_INTS]]
+
+
+class AudioWaveFormBars:
+    # the bars of a paint grouped by color, each group is filled in a single call,
+    # rounded bars are stamped from a sprite per shape and color, or filled as a
+    # path when too few share them
+    def __init__(self, radius: int, color: COLORS = None):
+        self.radius = radius
+        # overrides the color of every bar, the seekColor of the played layer
+        self.color = color
+        self.groups: dict[int, BAR_GROUP] = {}
+
+    def group(self, color: COLORS) -> BAR_GROUP:
+        # colors are shared objects through a paint, their identity is a cheap key
+        group = self.groups.get(id(color))
+        if group is None:
+            group = self.groups[id(color)] = color, [], {}
+        return group
+
+    def add(
+        self,
+        rect: typing.Union[QRect, QRectF],
+        color: COLORS,
+        y: int = 0,
+        half_y: int = 0,
+    ):
+        _, rects, shapes = self.group(self.color or color)
+        if self.radius:
+            left, top, width, height = RoundedPolygon.bounds(rect)
+            shapes.setdefault((width, height), []).append((left, top))
+            if y and half_y:
+                rects.append(QRectF(rect.x(), y, rect.width(), half_y))
+        else:
+            # square bars need neither a sprite nor the half patch
+            rects.append(QRectF(rect))
+
+    def paint(self, painter: QPainter):
+        ratio = painter.device().devicePixelRatioF()
+        painter.save()
+        painter.setPen(Qt.NoPen)
+        for color, rects, shapes in self.groups.values():
+            color = QColor(color)
+            if rects:
+                painter.setBrush(color)
+                painter.drawRects(rects)
+
+            path = QPainterPath()
+            for (width, height), points in shapes.items():
+                if len(points) < TINTED_BARS:
+                    template = RoundedPolygon.template(self.radius, width, height)
+                    for left, top in points:
+                        path.addPath(template.translated(left, top))
+                    continue
+
+                sprite = RoundedPolygon.sprite(self.radius, width, height, color, ratio)
+                for left, top in points:
+                    painter.drawPixmap(left, top, sprite)
+
+            if not path.isEmpty():
+                painter.fillPath(path, color)
+        painter.restore()
+
 
 DEFAULT_MARGINS = QMargins(0, 0, 0, 0)
+# the bars painted by AudioWaveForm.paintChannel, a slice of them when scrolling
+ALL_COLUMNS = slice(None)
+NO_COLUMNS = slice(0, 0)
+# the gravities whose bars depend on their own point alone, scrolled as painted
+SCROLLING_GRAVITIES = (
+    AudioWaveFormGravity.Average,
+    AudioWaveFormGravity.Min_Max,
+    AudioWaveFormGravity.Max,
+    AudioWaveFormGravity.Min,
+)
 
 
 class AudioWaveForm(QFrame):
@@ -302,6 +642,10 @@ class AudioWaveForm(QFrame):
         self.setChannel2(waveFormChannel2)
 
         self.seekRatio: float = 0
+        # the background, bars and grid, unplayed and played, repainted when
+        # layerKey changes
+        self.layers: dict[bool, QPixmap] = {}
+        self.layerKey: tuple = None
 
         self.setAttribute(Qt.WA_Hover, True)
 
@@ -407,11 +751,6 @@ class AudioWaveForm(QFrame):
     def mouseMoveEvent(self, event: QMouseEvent) -> None:
         self.mousePressEvent(event)
 
-    def get_seekColor(self, x: int, color: COLORS, seekColor: COLORS) -> COLORS:
-        if self.seekRatio > self.xRatio(x):
-            return seekColor or color
-        return color
-
     def paintGrid(
         self,
         painter: QPainter,
@@ -477,6 +816,33 @@ class AudioWaveForm(QFrame):
             path = self.roundRectPath(rect, rect.width() / 2)
             painter.fillPath(path, QColor(seekerColor))
 
+    def barColors(
+        self, channel: AudioWaveFormChannel, pixels: int, color: COLORS
+    ) -> typing.Iterable[COLORS]:
+        # the color of every bar, by its spectral centroid when spectrumColors is set
+        palette = channel.options.spectrumPalette()
+        if not (palette and channel.centroids):
+            return itertools.repeat(color)
+        return map(palette.__getitem__, channel.sampled("centroids", pixels, 0))
+
+    def paintedBars(
+        self,
+        channel: AudioWaveFormChannel,
+        values: SAMPLES,
+        pixels: int,
+        color: COLORS,
+        columns: slice = ALL_COLUMNS,
+    ) -> typing.Iterable[tuple[float, COLORS]]:
+        # the values with their colors, of the bars within columns alone
+        bars = zip(values, self.barColors(channel, pixels, color))
+        return itertools.islice(bars, columns.start, columns.stop)
+
+    def waveFormBars(
+        self, channel: AudioWaveFormChannel, played: bool = False
+    ) -> AudioWaveFormBars:
+        seekColor = channel.options.seekColor if played else None
+        return AudioWaveFormBars(channel.options.radius, seekColor)
+
     def paintWaveFormSample(
         self,
         painter: QPainter,
@@ -486,13 +852,9 @@ class AudioWaveForm(QFrame):
         y: int = 0,
         half_y: int = 0,
     ):
-        seekColor = channel.options.seekColor
-        color = self.get_seekColor(rect.x(), color, seekColor)
-        path = self.roundRectPath(rect, channel.options.radius)
-        painter.fillPath(path, QColor(color))
-
-        if y and half_y:
-            painter.fillRect(rect.x(), y, rect.width(), half_y, color)
+        bars = self.waveFormBars(channel)
+        bars.add(rect, color, y, half_y)
+        bars.paint(painter)
 
     def paintAverage(
         self,
@@ -501,24 +863,31 @@ class AudioWaveForm(QFrame):
         scale: int,
         top: int,
         pixels: int,
+        played: bool = False,
+        columns: slice = ALL_COLUMNS,
+        name: str = "averages",
     ):
-        averages = channel.sampleAverages(pixels, scale)
+        # bars about the midline of the averages, rms or loudness points
+        averages = channel.sampled(name, pixels, scale)
         avgColor = channel.options.avgColor
-        x = self.waveFormRect().left()
         offset = channel.options.offset()
+        x = self.waveFormRect().left() + (columns.start or 0) * offset
         pixelWidth = channel.options.pixelWidth
         emptyPixelHeight = channel.options.emptyPixelHeight
         zoom = channel.options.zoom
 
-        for avg in averages:
+        bars = self.waveFormBars(channel, played)
+        for avg, avgColor in self.paintedBars(
+            channel, averages, pixels, avgColor, columns
+        ):
             avg = avg or emptyPixelHeight
             avg *= zoom
             avg_rect = QRectF(x, top + (scale - avg) // 2, pixelWidth, avg)
-            self.paintWaveFormSample(
-                painter=painter, channel=channel, rect=avg_rect, color=avgColor
-            )
+            bars.add(rect=avg_rect, color=avgColor)
             x += offset
 
+        bars.paint(painter)
+
     def paintMin_Max(
         self,
         painter: QPainter,
@@ -527,28 +896,31 @@ class AudioWaveForm(QFrame):
         top: int,
         pixels: int,
         midline: int,
+        played: bool = False,
+        columns: slice = ALL_COLUMNS,
     ):
         scale //= 2
-        maximums = channel.sampleMaximums(pixels, scale)
+        maximums = channel.sampled("maximums", pixels, scale)
         waveFormRect = self.waveFormRect()
-        left = waveFormRect.left()
+        offset = channel.options.offset()
+        left = waveFormRect.left() + (columns.start or 0) * offset
 
         x = left
-        offset = channel.options.offset()
         pixelWidth = channel.options.pixelWidth
         emptyPixelHeight = channel.options.emptyPixelHeight
         maxColor = channel.options.maxColor
         zoom = channel.options.zoom
 
-        for max in maximums:
+        bars = self.waveFormBars(channel, played)
+        for max, maxColor in self.paintedBars(
+            channel, maximums, pixels, maxColor, columns
+        ):
             max = max or emptyPixelHeight
             max *= zoom
             y = top + scale - max
             half_max = max // 2
             max_rect = QRectF(x, y, pixelWidth, max)
-            self.paintWaveFormSample(
-                painter=painter,
-                channel=channel,
+            bars.add(
                 rect=max_rect,
                 color=maxColor,
                 y=max_rect.bottom() - half_max,
@@ -556,18 +928,18 @@ class AudioWaveForm(QFrame):
             )
             x += offset
 
-        minimums = channel.sampleMinimums(pixels, scale)
+        minimums = channel.sampled("minimums", pixels, scale)
         minColor = channel.options.minColor
 
         x = left
-        for min in minimums:
+        for min, minColor in self.paintedBars(
+            channel, minimums, pixels, minColor, columns
+        ):
             min = min or emptyPixelHeight
             min *= zoom
             y = midline
             min_rect = QRectF(x, y, pixelWidth, min)
-            self.paintWaveFormSample(
-                painter=painter,
-                channel=channel,
+            bars.add(
                 rect=min_rect,
                 color=minColor,
                 y=y,
@@ -575,6 +947,8 @@ class AudioWaveForm(QFrame):
             )
             x += offset
 
+        bars.paint(painter)
+
     def paintMinMax(
         self,
         painter: QPainter,
@@ -582,22 +956,27 @@ class AudioWaveForm(QFrame):
         scale: int,
         top: int,
         pixels: int,
+        played: bool = False,
+        columns: slice = ALL_COLUMNS,
     ):
         isMax = channel.options.gravity == AudioWaveFormGravity.Max
         if isMax:
-            points = channel.sampleMaximums(pixels, scale)
+            points = channel.sampled("maximums", pixels, scale)
             pointColor = channel.options.maxColor
         else:
-            points = channel.sampleMinimums(pixels, scale)
+            points = channel.sampled("minimums", pixels, scale)
             pointColor = channel.options.minColor
-        x = self.waveFormRect().left()
-
         offset = channel.options.offset()
+        x = self.waveFormRect().left() + (columns.start or 0) * offset
+
         pixelWidth = channel.options.pixelWidth
         emptyPixelHeight = channel.options.emptyPixelHeight
         zoom = channel.options.zoom
 
-        for point in points:
+        bars = self.waveFormBars(channel, played)
+        for point, pointColor in self.paintedBars(
+            channel, points, pixels, pointColor, columns
+        ):
             point = point or emptyPixelHeight
             point *= zoom
             y = top
@@ -609,9 +988,7 @@ class AudioWaveForm(QFrame):
             if isMax:
                 y = point_rect.bottom() - half_point
 
-            self.paintWaveFormSample(
-                painter=painter,
-                channel=channel,
+            bars.add(
                 rect=point_rect,
                 color=pointColor,
                 y=y,
@@ -620,6 +997,8 @@ class AudioWaveForm(QFrame):
 
             x += offset
 
+        bars.paint(painter)
+
     def paintChannel(
         self,
         painter: QPainter,
@@ -628,6 +1007,8 @@ class AudioWaveForm(QFrame):
         bottom: int,
         scale: int,
         midline: int,
+        played: bool = False,
+        columns: slice = ALL_COLUMNS,
     ):
         if not channel.hasData():
             return
@@ -641,7 +1022,13 @@ class AudioWaveForm(QFrame):
 
         if channel.options.gravity == AudioWaveFormGravity.Average:
             self.paintAverage(
-                painter=painter, channel=channel, scale=scale, top=top, pixels=pixels
+                painter=painter,
+                channel=channel,
+                scale=scale,
+                top=top,
+                pixels=pixels,
+                played=played,
+                columns=columns,
             )
 
         elif channel.options.gravity == AudioWaveFormGravity.Min_Max:
@@ -652,6 +1039,8 @@ class AudioWaveForm(QFrame):
                 top=top,
                 pixels=pixels,
                 midline=midline,
+                played=played,
+                columns=columns,
             )
 
         elif channel.options.gravity in [
@@ -659,7 +1048,32 @@ class AudioWaveForm(QFrame):
             AudioWaveFormGravity.Min,
         ]:
             self.paintMinMax(
-                painter=painter, channel=channel, scale=scale, top=top, pixels=pixels
+                painter=painter,
+                channel=channel,
+                scale=scale,
+                top=top,
+                pixels=pixels,
+                played=played,
+                columns=columns,
+            )
+
+        elif channel.options.gravity in [
+            AudioWaveFormGravity.RMS,
+            AudioWaveFormGravity.Loudness,
+        ]:
+            self.paintAverage(
+                painter=painter,
+                channel=channel,
+                scale=scale,
+                top=top,
+                pixels=pixels,
+                played=played,
+                columns=columns,
+                name=(
+                    "loudness"
+                    if channel.options.gravity == AudioWaveFormGravity.Loudness
+                    else "rms"
+                ),
             )
 
         if grid := channel.options.grid:
@@ -673,63 +1087,219 @@ class AudioWaveForm(QFrame):
                 gridColor=channel.options.gridColor,
             )
 
-        self.paintSeekBar(
-            painter=painter, channel=channel, midline=midline, scale=scale
+    def paintedChannels(self) -> list[tuple[AudioWaveFormChannel, QRect, int]]:
+        # the visible channels with their rectangle and midline
+        if self.isBothChannels():
+            return [
+                (channel, channel_rect, channel_rect.center().y())
+                for channel, channel_rect in [
+                    (self.waveFormChannel1, self.waveFormChannel1Rect()),
+                    (self.waveFormChannel2, self.waveFormChannel2Rect()),
+                ]
+            ]
+
+        elif self.isChannel1() or self.isChannel2():
+            channel = (
+                self.waveFormChannel1 if self.isChannel1() else self.waveFormChannel2
+            )
+            return [(channel, self.waveFormRect(), self.waveFormMidlineY)]
+
+        return []
+
+    def waveFormLayerKey(
+        self, scrolled: AudioWaveFormChannel = None, version: int = 0
+    ) -> tuple:
+        # everything the layer is painted from, compared by equality, with the
+        # version of the scrolled channel before its scroll when given
+        channels = tuple(
+            (
+                id(channel),
+                version if channel is scrolled else channel.version,
+                channel.min,
+                channel.max,
+            )
+            if channel
+            else None
+            for channel in [self.waveFormChannel1, self.waveFormChannel2]
+        )
+        return (
+            self.size(),
+            self.devicePixelRatioF(),
+            self.backgroundColor,
+            self.backgroundRadius,
+            QMargins(self.margins),
+            self.channelsPixelSpacing,
+            channels,
         )
 
-    def paintEvent(self, _: QPaintEvent) -> None:
-        painter = QPainter(self)
+    def isSeekColored(self) -> bool:
+        return any(
+            channel and channel.options.seekColor
+            for channel in [self.waveFormChannel1, self.waveFormChannel2]
+        )
 
-        rect = self.rect()
+    def paintLayer(
+        self,
+        painter: QPainter,
+        played: bool = False,
+        scrolled: AudioWaveFormChannel = None,
+        columns: slice = ALL_COLUMNS,
+    ):
+        # the columns of the scrolled channel alone when given, the other channels
+        # paint their background and grid over them still
         # waveForm rectangle
         waveFormRect = self.waveFormRect()
         point_path = self.roundRectPath(waveFormRect, self.backgroundRadius)
         painter.fillPath(point_path, QColor(self.backgroundColor))
 
-        # waveForm mid line
-        waveFormMidline = self.waveFormMidline
-        waveFormMidlineY = waveFormMidline.y1()
+        channels = self.paintedChannels()
+        for channel, channel_rect, midline in channels:
+            painter.save()
+            if len(channels) > 1:
+                # a channel paints within its rectangle alone, to scroll on its own
+                painter.setClipRect(channel_rect, Qt.IntersectClip)
+                painter.fillRect(channel_rect, channel.options.background)
+
+            painted = columns
+            if scrolled and channel is not scrolled:
+                painted = NO_COLUMNS
 
-        # painter.drawRect(waveFormRect)
-        # painter.drawLine(waveFormMidline)
+            self.paintChannel(
+                painter=painter,
+                channel=channel,
+                scale=channel_rect.height(),
+                top=channel_rect.top(),
+                bottom=channel_rect.bottom(),
+                midline=midline,
+                played=played,
+                columns=painted,
+            )
+            painter.restore()
+
+    def waveFormLayer(self, played: bool = False) -> QPixmap:
+        # the bars in their colors, or in their seekColor when played
+        key = self.waveFormLayerKey()
+        if key != self.layerKey:
+            self.layers.clear()
+            self.layerKey = key
+
+        if played not in self.layers:
+            ratio = self.devicePixelRatioF()
+            layer = QPixmap(self.size() * ratio)
+            layer.setDevicePixelRatio(ratio)
+            layer.fill(Qt.transparent)
+
+            painter = QPainter(layer)
+            try:
+                self.paintLayer(painter, played)
+            finally:
+                painter.end()
+
+            self.layers[played] = layer
+        return self.layers[played]
+
+    def scrollChannel(
+        self, channel: AudioWaveFormChannel, version: int, points: int = 1
+    ):
+        # moves the bars of the channel, as painted at version, left by points in the
+        # layers and paints the bars exposed at the end alone, repaints the layers
+        # whole when the bars are not the same ones moved along
+        options = channel.options
+        offset = options.offset()
+        waveFormRect = self.waveFormRect()
+        pixels = options.pixelsPerWidth(waveFormRect.width() - 1)
+        ratio = self.devicePixelRatioF()
+        shift = points * offset
+        # the bars under the rounded corners of the background are painted again
+        edge = math.ceil(self.backgroundRadius / offset)
+        channels = self.paintedChannels()
+        painted = [entry for entry in channels if entry[0] is channel]
+
+        if not (
+            painted
+            and self.layers
+            and self.layerKey == self.waveFormLayerKey(channel, version)
+            and options.gravity in SCROLLING_GRAVITIES
+            # clusters are as long as the pixels, not a bar per point
+            and options.samplingMethod != SamplingMethod.Cluster
+            and not channel.view
+            and not (options.collapseSilence and channel.silence)
+            # scaled by the channel's own range, not by the range of the points
+            and channel.min
+            and channel.max
+            # a bar per point, sampled as they are
+            and len(channel.minimums) == pixels
+            and points + 2 * edge < pixels
+            # whole device pixels to scroll by
+            and float(ratio).is_integer()
+        ):
+            self.update()
+            return
+
+        # a lone channel's bars may reach past its rectangle
+        _, channel_rect, _ = painted[0]
+        if len(channels) == 1:
+            channel_rect = self.rect()
+        area = QRect(
+            waveFormRect.left(),
+            channel_rect.top(),
+            waveFormRect.width(),
+            channel_rect.height(),
+        )
+        # QPixmap.scroll is in device pixels
+        deviceArea = QRectF(
+            QPointF(area.topLeft()) * ratio, QSizeF(area.size()) * ratio
+        ).toRect()
+
+        start = pixels - points - edge
+        exposed = QRect(
+            QPoint(area.left() + start * offset, area.top()), area.bottomRight()
+        )
+        strips = [(exposed, slice(start, None))]
+        if edge:
+            cornered = QRect(area.left(), area.top(), edge * offset, area.height())
+            strips.append((cornered, slice(0, edge)))
+
+        for played, layer in self.layers.items():
+            layer.scroll(-int(shift * ratio), 0, deviceArea)
+
+            painter = QPainter(layer)
+            try:
+                for strip, columns in strips:
+                    painter.setClipRect(strip)
+                    painter.setCompositionMode(QPainter.CompositionMode_Source)
+                    painter.fillRect(strip, Qt.transparent)
+                    painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+                    self.paintLayer(painter, played, channel, columns)
+            finally:
+                painter.end()
+
+        self.layerKey = self.waveFormLayerKey()
+        self.update(area)
+
+    def paintOverlay(self, painter: QPainter):
+        # the seeker, cheap enough to paint on every update
+        for channel, channel_rect, midline in self.paintedChannels():
+            self.paintSeekBar(
+                painter=painter,
+                channel=channel,
+                midline=midline,
+                scale=channel_rect.height(),
+            )
+
+    def paintEvent(self, _: QPaintEvent) -> None:
+        # the cached layers are blitted, only the overlay is painted on seeking
+        painter = QPainter(self)
         try:
-            if self.isBothChannels():
-
-                waveFormChannel1_rect = self.waveFormChannel1Rect()
-                waveFormChannel2_rect = self.waveFormChannel2Rect()
-
-                for channel_rect, channel in zip(
-                    [waveFormChannel1_rect, waveFormChannel2_rect],
-                    [self.waveFormChannel1, self.waveFormChannel2],
-                ):
-                    painter.fillRect(channel_rect, channel.options.background)
-
-                    self.paintChannel(
-                        painter=painter,
-                        channel=channel,
-                        scale=channel_rect.height(),
-                        top=channel_rect.top(),
-                        bottom=channel_rect.bottom(),
-                        midline=channel_rect.center().y(),
-                    )
+            painter.drawPixmap(0, 0, self.waveFormLayer())
+            if self.isSeekColored() and (seekX := self.seekX) > 0:
+                painter.save()
+                painter.setClipRect(QRectF(0, 0, seekX, self.height()))
+                painter.drawPixmap(0, 0, self.waveFormLayer(played=True))
+                painter.restore()
+
+            self.paintOverlay(painter)
 
-            elif self.isChannel1() or self.isChannel2():
-                top = waveFormRect.top()
-                bottom = waveFormRect.bottom()
-                scale = waveFormRect.height()
-                channel = (
-                    self.waveFormChannel1
-                    if self.isChannel1()
-                    else self.waveFormChannel2
-                )
-                self.paintChannel(
-                    painter=painter,
-                    channel=channel,
-                    scale=scale,
-                    top=top,
-                    bottom=bottom,
-                    midline=waveFormMidlineY,
-                )
         except Exception as e:
             print(e)
 
@@ -808,7 +1378,7 @@ class LiveAudioWaveFormChannel(AudioWaveChannel, QObject):
         )
 
         self.waveFormChannel.min = min(self.waveform_minimums)
-        self.waveFormChannel.max = min(self.waveform_maximums)
+        self.waveFormChannel.max = max(self.waveform_maximums)
 
     def patchPixels(self, pixels: INTS, before: bool = 1):
         remaining = self.visiblePixels - len(pixels)
@@ -861,7 +1431,8 @@ class LiveAudioWaveFormChannel(AudioWaveChannel, QObject):
         max_pixels = self.getPixels(self.waveform_maximums)
 
         if self.waveFormChannel:
-            self.waveFormChannel.setMinMax(min_pixels, max_pixels)
+            # the pixels move a point along every tick
+            self.waveFormChannel.scroll(min_pixels, max_pixels)
 
         self.currentPixelChanged.emit(self.currentPixel)
         self.currentPixel += 1
@@ -924,11 +1495,12 @@ class LiveAudioWaveForm(AudioWaveForm):
             self.update()
 
     def setVisiblePixels(self):
+        # a point per bar painted, so ticks scroll the bars
         width = (
             self.waveFormRect().width()
             if not self.isBothChannels()
             else self.waveFormChannel1Rect().width()
-        )
+        ) - 1
         if self.liveWaveFormChannel1:
             self.liveWaveFormChannel1.setVisiblePixels(width)
         if self.liveWaveFormChannel2:
@@ -233,7 +233,15 @@ class AudioWavePlayer(LiveAudioWave):
     def __init__(self, **kwargs) -> None:
         super().__init__(False, **kwargs)
 
-    def play(self, byteArray: QByteArray = b"", file: str = ""):
+    def play(
+        self,
+        byteArray: QByteArray = b"",
+        file: str = "",
+        silence: AudioWaveSilence = None,
+        skipSilence: bool = False,
+    ):
+        # silence cuts its silent runs out of the played frames, skipSilence
+        # detects those of the file with AudioWave.silence
         if file:
             wave_read = wave.Wave_read(file)
             channels = wave_read.getnchannels()
@@ -248,6 +256,15 @@ class AudioWavePlayer(LiveAudioWave):
                 rate=rate,
             )
 
+            if skipSilence and not silence:
+                audioWave = AudioWave(file=file)
+                silence = audioWave.silence()
+                audioWave.clear()
+
+        if silence:
+            frameWidth = self.audioFormat.bytesPerFrame()
+            byteArray = silence.audible(bytes(byteArray), frameWidth)
+
         self.start(byteArray)
 
 
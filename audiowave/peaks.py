@@ -0,0 +1,164 @@
+"""
+Batch generation of audiowaveform .dat / .json peaks from wave files.
+
+    python -m audiowave.peaks recordings/ "uploads/**/*.wav" -o peaks/ -f dat json
+"""
+
+import argparse, glob, os, struct, sys, time, wave
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from .audiowave import AudioWavePeaks
+except ImportError:
+    from audiowave import AudioWavePeaks
+
+__author__ = "PRMPSmart @prmpsmart"
+
+WAVE_EXTENSIONS = (".wav", ".wave")
+
+
+def find_waves(patterns: list[str]) -> list[str]:
+    files: list[str] = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, _, names in os.walk(pattern):
+                files.extend(
+                    os.path.join(root, name)
+                    for name in names
+                    if name.lower().endswith(WAVE_EXTENSIONS)
+                )
+        else:
+            files.extend(glob.glob(pattern, recursive=True))
+
+    # a file matched by several patterns is processed once
+    return sorted(set(files))
+
+
+def output_paths(
+    file: str, output: str, formats: list[str], root: str = ""
+) -> list[str]:
+    # under output the folders of file below root are kept
+    directory = os.path.dirname(file)
+    if output:
+        directory = os.path.join(output, os.path.relpath(directory, root or "."))
+    name = os.path.splitext(os.path.basename(file))[0]
+    return [os.path.join(directory, f"{name}.{extension}") for extension in formats]
+
+
+def is_current(file: str, outputs: list[str]) -> bool:
+    mtime = os.stat(file).st_mtime_ns
+    for output in outputs:
+        if not os.path.exists(output) or os.stat(output).st_mtime_ns < mtime:
+            return False
+    return True
+
+
+def generate(
+    file: str, outputs: list[str], samples_per_pixel: int, bits: int, force: bool
+) -> tuple[str, int, str]:
+    # runs in a worker process, returns (file, bytes read, error)
+    try:
+        if not force and is_current(file, outputs):
+            return file, 0, ""
+
+        peaks = AudioWavePeaks.from_wave(file, samples_per_pixel, bits)
+        for output in outputs:
+            os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+            peaks.save(output)
+
+        return file, os.path.getsize(file), ""
+
+    # unsupported sample widths fail the asserts of the codecs
+    except (
+        OSError,
+        EOFError,
+        wave.Error,
+        AssertionError,
+        struct.error,
+        ValueError,
+    ) as error:
+        return file, 0, str(error) or type(error).__name__
+
+
+def main(args: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m audiowave.peaks",
+        description="generates audiowaveform peak files of wave files in parallel",
+    )
+    parser.add_argument("inputs", nargs="+", help="wave files, directories or globs")
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="",
+        help="output directory mirroring the input folders, next to each wave by default",
+    )
+    parser.add_argument(
+        "-f", "--formats", nargs="+", choices=["dat", "json"], default=["dat"]
+    )
+    parser.add_argument("-s", "--samples-per-pixel", type=int, default=256)
+    parser.add_argument("-b", "--bits", type=int, choices=[8, 16], default=16)
+    parser.add_argument(
+        "-w", "--workers", type=int, default=0, help="processes, a core each by default"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="regenerate current outputs"
+    )
+    options = parser.parse_args(args)
+
+    files = find_waves(options.inputs)
+    if not files:
+        print("no wave files found", file=sys.stderr)
+        return 1
+
+    root = ""
+    if options.output:
+        root = os.path.commonpath(
+            [os.path.dirname(os.path.abspath(file)) for file in files]
+        )
+    outputs = [
+        output_paths(os.path.abspath(file), options.output, options.formats, root)
+        for file in files
+    ]
+
+    # waves only told apart by their extension would write the same outputs
+    written: dict[str, str] = {}
+    for file, paths in zip(files, outputs):
+        for path in paths:
+            if path in written:
+                print(f"{file}: writes {path} of {written[path]}", file=sys.stderr)
+                return 1
+            written[path] = file
+
+    start = time.perf_counter()
+    generated = skipped = failed = total_bytes = 0
+
+    with ProcessPoolExecutor(options.workers or None) as executor:
+        results = executor.map(
+            generate,
+            files,
+            outputs,
+            [options.samples_per_pixel] * len(files),
+            [options.bits] * len(files),
+            [options.force] * len(files),
+        )
+
+        for file, size, error in results:
+            if error:
+                failed += 1
+                print(f"{file}: {error}", file=sys.stderr)
+            elif size:
+                generated += 1
+                total_bytes += size
+            else:
+                skipped += 1
+
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(
+        f"{generated} generated, {skipped} current, {failed} failed in {elapsed:.2f}s "
+        f"({generated / elapsed:.1f} files/s, {total_bytes / elapsed / 1e6:.1f} MB/s)"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
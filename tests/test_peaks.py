@@ -0,0 +1,119 @@
+import array, os, site, struct, wave
+
+site.addsitedir(os.path.join(os.path.dirname(__file__), "..", "audiowave"))
+
+import pytest
+from audiowave import AudioWave, AudioWaveCache, AudioWaveChannel, AudioWavePeaks
+
+ASSETS = os.path.join(os.path.dirname(__file__), "assets")
+
+
+def open_wave(file: str) -> AudioWave:
+    audiowave = AudioWave()
+    audiowave.open(file)
+    return audiowave
+
+
+def write_wave(path: str, samples: list[int], sample_width: int, channels: int = 1):
+    with wave.open(path, "wb") as wave_write:
+        wave_write.setnchannels(channels)
+        wave_write.setsampwidth(sample_width)
+        wave_write.setframerate(8000)
+        if sample_width == 1:
+            data = bytes(sample + 128 for sample in samples)
+        else:
+            data = b"".join(
+                sample.to_bytes(sample_width, "little", signed=True)
+                for sample in samples
+            )
+        wave_write.writeframes(data)
+
+
+@pytest.mark.parametrize("extension", [".dat", ".json"])
+@pytest.mark.parametrize("bits", [8, 16])
+def test_round_trip(tmp_path, extension, bits):
+    audiowave = open_wave(os.path.join(ASSETS, "test_stereo.wav"))
+    peaks = audiowave.derive_peaks(256, bits, spectrum=extension == ".json")
+    file = str(tmp_path / f"peaks{extension}")
+    peaks.save(file)
+
+    loaded = AudioWavePeaks.load(file)
+    assert loaded.bits == bits
+    assert loaded.channels == peaks.channels
+    assert loaded.samples_per_pixel == 256
+    assert loaded.sample_rate == audiowave.frame_rate
+    for channel in range(1, peaks.channels + 1):
+        assert list(map(list, loaded.channel_min_max(channel))) == list(
+            map(list, peaks.channel_min_max(channel))
+        )
+        assert list(loaded.channel_centroids(channel)) == list(
+            peaks.channel_centroids(channel)
+        )
+
+
+def test_dat_matches_from_wave():
+    file = os.path.join(ASSETS, "test.wav")
+    derived = open_wave(file).derive_peaks(512).to_dat()
+    assert AudioWavePeaks.from_wave(file, 512).to_dat() == derived
+    assert AudioWavePeaks.from_dat(derived).to_dat() == derived
+
+
+@pytest.mark.parametrize("sample_width", [1, 2, 3, 4])
+@pytest.mark.parametrize("bits", [8, 16])
+def test_save_channel_peaks(tmp_path, sample_width, bits):
+    peak = 2 ** (sample_width * 8 - 1)
+    samples = [-peak, peak - 1, -peak // 2, peak // 2, 0, 1] * 50
+    file = str(tmp_path / "wave.wav")
+    write_wave(file, samples, sample_width)
+
+    audiowave = open_wave(file)
+    channel = audiowave.analyse_channel(1, 4)
+    dat = str(tmp_path / "channel.dat")
+    channel.savePeaks(dat, audiowave.frame_rate, 4, bits)
+
+    peaks = AudioWavePeaks.load(dat)
+    assert list(peaks.channel_min_max(1)[0]) == list(
+        audiowave.derive_peaks(4, bits).channel_min_max(1)[0]
+    )
+    low, high = -(2 ** (bits - 1)), 2 ** (bits - 1) - 1
+    assert min(peaks.channel_min_max(1)[0]) == low
+    assert max(peaks.channel_min_max(1)[1]) <= high
+
+
+def test_save_appended_channel(tmp_path):
+    channel = AudioWaveChannel([-3, -2], [2, 3])
+    channel.append(array.array("d", [-1.5, -30000.0]), array.array("d", [1.5, 30000]))
+    file = str(tmp_path / "appended.json")
+    channel.savePeaks(file)
+
+    minimums, maximums = AudioWavePeaks.load(file).channel_min_max(1)
+    assert list(minimums) == [-3, -2, -2, -30000]
+    assert list(maximums) == [2, 3, 1, 30000]
+
+
+def test_clamped_interleave():
+    peaks = AudioWavePeaks([[array.array("d", [-200.0, 0.5]), [300, 127]]], bits=8)
+    dat = AudioWavePeaks.from_dat(peaks.to_dat())
+    assert list(dat.channel_min_max(1)[0]) == [-128, 0]
+    assert list(dat.channel_min_max(1)[1]) == [127, 127]
+    assert struct.unpack_from("<I", peaks.to_dat(), 4)[0] == AudioWavePeaks.FLAG_8_BITS
+
+
+def test_cached_channel(tmp_path):
+    file = os.path.join(ASSETS, "test_stereo.wav")
+    channels = []
+    for _ in range(2):
+        audiowave = open_wave(file)
+        audiowave.cache = AudioWaveCache(str(tmp_path))
+        channels.append(AudioWaveChannel.from_audiowave(audiowave, 64, 2))
+
+    built, cached = channels
+    assert sorted(os.path.splitext(name)[1] for name in os.listdir(tmp_path)) == [
+        ".dat",
+        ".pyramid",
+    ]
+    assert list(cached.minimums) == list(built.minimums)
+    for name in ("minimumsLevels", "maximumsLevels", "averagesLevels"):
+        assert list(map(list, getattr(cached.pyramid, name))) == list(
+            map(list, getattr(built.pyramid, name))
+        )